@@ -0,0 +1,140 @@
+"""
+Per-request cost of the get_current_user dependency.
+
+Three routes on an in-process ASGI app, driven through httpx:
+
+- "anonymous": a handler without authentication (what the routers had)
+- "auth warm": get_current_user with the token / user caches populated
+- "auth cold": get_current_user with both caches cleared before every
+  request (JWT decode + users lookup each time)
+
+The users collection is an in-memory stand-in, so "auth cold" measures the
+dependency itself, not a database round trip.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_auth_dependency [--requests 5000] [--rounds 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+# settings needs these before src is imported
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("SESSION_SECRET", "bench-session")
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+
+from src.api.deps import CurrentUser, get_current_user  # noqa: E402
+from src.core.cache import token_cache, user_cache  # noqa: E402
+from src.core.security import create_jwt  # noqa: E402
+from src.core.settings import settings  # noqa: E402
+from src.db.mongo import get_db  # noqa: E402
+
+DISCORD_ID = "123456789012345678"
+
+
+class _Users:
+    def __init__(self, doc: Dict[str, Any]) -> None:
+        self.doc = doc
+
+    async def find_one(self, *args: Any, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        return dict(self.doc)
+
+
+class _Db:
+    def __init__(self) -> None:
+        self.users = _Users(
+            {"discord": {"id": DISCORD_ID, "username": "bench", "avatar": None}}
+        )
+
+    def __getitem__(self, name: str) -> Any:
+        return getattr(self, name)
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    db = _Db()
+    app.dependency_overrides[get_db] = lambda: db
+
+    # like the existing handlers, which all depend on get_db
+    @app.get("/anonymous")
+    async def anonymous(db: Any = Depends(get_db)):
+        return {"ok": True}
+
+    @app.get("/auth")
+    async def authed(user: CurrentUser = Depends(get_current_user)):
+        return {"ok": True}
+
+    return app
+
+
+def _clear() -> None:
+    token_cache.clear()
+    user_cache.clear()
+
+
+async def run(requests: int, rounds: int) -> None:
+    cases = [
+        ("anonymous", "/anonymous", None),
+        ("auth warm", "/auth", None),
+        ("auth cold", "/auth", _clear),
+    ]
+    transport = httpx.ASGITransport(app=_app())
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://bench",
+        cookies={settings.SESSION_COOKIE_NAME: create_jwt(DISCORD_ID)},
+    ) as client:
+
+        async def timed(path: str, before: Optional[Callable[[], None]]) -> float:
+            if before is not None:
+                before()
+            start = time.perf_counter()
+            res = await client.get(path)
+            elapsed = time.perf_counter() - start
+            assert res.status_code == 200, res.text
+            return elapsed
+
+        # warm up imports, routing and the caches
+        for _ in range(100):
+            for _, path, before in cases:
+                await timed(path, before)
+
+        # requests are interleaved so drift affects every route alike;
+        # keep the best round per route
+        results = {name: float("inf") for name, _, _ in cases}
+        for _ in range(rounds):
+            totals = {name: 0.0 for name, _, _ in cases}
+            for _ in range(requests):
+                for name, path, before in cases:
+                    totals[name] += await timed(path, before)
+            for name, total in totals.items():
+                results[name] = min(results[name], total / requests)
+
+    baseline = results["anonymous"]
+    print(f"{'route':<10} | {'us/request':>10} | {'vs anonymous':>12}")
+    print("-" * 38)
+    for name, seconds in results.items():
+        print(
+            f"{name:<10} | {seconds * 1e6:>10.1f} "
+            f"| {(seconds - baseline) * 1e6:>+10.1f}us"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="get_current_user overhead")
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Throughput of the read path for 10k-document group / role listings.
+
+"before" replays what the handlers did before the fast path:
+GroupDB.model_validate -> GroupOut.from_db -> FastAPI response_model
+validation -> jsonable dict -> json.dumps.
+"after" is schemas.records: projected dict -> TypedDict record ->
+precompiled TypeAdapter.dump_json.
+
+No database needed; documents are generated in memory.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_read_serialization [--docs 10000] [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+from uuid import uuid4
+
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+from src.schemas import GroupDB, GroupOut, RoleDB, RoleOut
+from src.schemas.records import groups_json, roles_json
+
+
+def _group_doc(i: int) -> Dict[str, Any]:
+    return {
+        "_id": ObjectId(),
+        "uuid": str(uuid4()),
+        "name": f"Static group {i}",
+        "description": "Weekly roaming party",
+        "tags": ["pvp", "roam"],
+        "roles": [str(uuid4()) for _ in range(20)],
+        "creator_id": "123456789012345678",
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _role_doc(i: int) -> Dict[str, Any]:
+    return {
+        "_id": ObjectId(),
+        "uuid": str(uuid4()),
+        "name": f"Role {i}",
+        "description": "",
+        "role_type": "healer",
+        "items": {f"slot_{n}": f"ITEM_{n}" for n in range(10)},
+        "creator_id": "123456789012345678",
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _before(db_model: Any, out_model: Any) -> Callable[[List[Dict]], bytes]:
+    response_adapter = TypeAdapter(List[out_model])
+
+    def run(docs: List[Dict]) -> bytes:
+        out = [out_model.from_db(db_model.model_validate(d)) for d in docs]
+        # what FastAPI's serialize_response does with a response_model
+        content = [m.model_dump() for m in out]
+        validated = response_adapter.validate_python(content)
+        jsonable = response_adapter.dump_python(validated, mode="json")
+        return json.dumps(jsonable, separators=(",", ":")).encode()
+
+    return run
+
+
+def _measure(fn: Callable[[List[Dict]], bytes], docs: List[Dict], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(docs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Read-path serialization")
+    parser.add_argument("--docs", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        (
+            "groups",
+            [_group_doc(i) for i in range(args.docs)],
+            _before(GroupDB, GroupOut),
+            groups_json,
+        ),
+        (
+            "roles",
+            [_role_doc(i) for i in range(args.docs)],
+            _before(RoleDB, RoleOut),
+            roles_json,
+        ),
+    ]
+
+    print(f"{'listing':<8} | {'path':<7} | {'best ms':>9} | {'docs/s':>10}")
+    print("-" * 44)
+    for name, docs, before, after in cases:
+        for label, fn in (("before", before), ("after", after)):
+            seconds = _measure(fn, docs, args.rounds)
+            print(
+                f"{name:<8} | {label:<7} | {seconds * 1000:>9.1f} "
+                f"| {len(docs) / seconds:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,21 @@ import os
 from datetime import datetime, timezone
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi.responses import RedirectResponse
 
-from ...core.security import create_jwt, verify_jwt
+from ...core.http import get_http_client
+from ...core.security import create_jwt
 from ...core.settings import settings
 from ...db.mongo import get_db
+from ...services.users import invalidate_user
+from ..deps import CurrentUser, get_current_user
 
 router = APIRouter(prefix="/auth/discord", tags=["auth"])
 
-DISCORD_AUTHORIZE = "https://discord.com/api/oauth2/authorize"
-DISCORD_TOKEN = "https://discord.com/api/oauth2/token"
-DISCORD_ME = "https://discord.com/api/users/@me"
+DISCORD_AUTHORIZE = f"{settings.DISCORD_API_BASE}/oauth2/authorize"
+DISCORD_TOKEN = f"{settings.DISCORD_API_BASE}/oauth2/token"
+DISCORD_ME = f"{settings.DISCORD_API_BASE}/users/@me"
 
 FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN", "http://localhost:3000")
 SESSION_COOKIE_NAME = os.getenv("SESSION_COOKIE_NAME", "session")
@@ -45,6 +48,7 @@ async def callback(
     request: Request,
     state: str | None = None,
     db=Depends(get_db),
+    client: httpx.AsyncClient = Depends(get_http_client),
 ):
     data = {
         "client_id": settings.DISCORD_CLIENT_ID,
@@ -55,20 +59,19 @@ async def callback(
     }
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        token_res = await client.post(DISCORD_TOKEN, data=data, headers=headers)
-        if token_res.status_code != 200:
-            return RedirectResponse(settings.FRONTEND_ERROR_URL)
-        tokens = token_res.json()
-        access_token = tokens["access_token"]
-
-        # 2) Get user profile
-        me_res = await client.get(
-            DISCORD_ME, headers={"Authorization": f"Bearer {access_token}"}
-        )
-        if me_res.status_code != 200:
-            return RedirectResponse(settings.FRONTEND_ERROR_URL)
-        profile = me_res.json()
+    token_res = await client.post(DISCORD_TOKEN, data=data, headers=headers)
+    if token_res.status_code != 200:
+        return RedirectResponse(settings.FRONTEND_ERROR_URL)
+    tokens = token_res.json()
+    access_token = tokens["access_token"]
+
+    # 2) Get user profile
+    me_res = await client.get(
+        DISCORD_ME, headers={"Authorization": f"Bearer {access_token}"}
+    )
+    if me_res.status_code != 200:
+        return RedirectResponse(settings.FRONTEND_ERROR_URL)
+    profile = me_res.json()
 
     # 3) Upsert user
     now = datetime.now(timezone.utc)
@@ -86,6 +89,7 @@ async def callback(
         "$setOnInsert": {"created_at": now},
     }
     await users.update_one({"discord.id": discord_id}, update, upsert=True)
+    invalidate_user(discord_id)
 
     # 4) Issue session cookie
     jwt_token = create_jwt(sub=str(discord_id))
@@ -94,7 +98,7 @@ async def callback(
         settings.FRONTEND_ORIGIN
     )
     response.set_cookie(
-        key="session",
+        key=settings.SESSION_COOKIE_NAME,
         value=jwt_token,
         httponly=True,
         secure=False,  # set True in production over HTTPS
@@ -118,18 +122,5 @@ async def logout(request: Request):
 
 
 @router.get("/me")
-async def me(request: Request, db=Depends(get_db)):
-    cookie = request.cookies.get("session")
-    if not cookie:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    try:
-        payload = verify_jwt(cookie)
-    except Exception:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    discord_id = payload["sub"]
-    user = await db["users"].find_one({"discord.id": discord_id}, {"_id": 0})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    return {"user": user}
+async def me(user: CurrentUser = Depends(get_current_user)):
+    return {"user": user.profile}
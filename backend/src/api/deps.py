@@ -0,0 +1,69 @@
+"""
+Request dependencies shared by the routers.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from fastapi import Depends, HTTPException, Request
+from jose import JWTError
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..core.security import verify_jwt_cached
+from ..core.settings import settings
+from ..db.mongo import get_db
+from ..services.users import get_user
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    discord_id: str
+    username: Optional[str]
+    global_name: Optional[str]
+    avatar: Optional[str]
+    # users document as stored (without _id)
+    profile: Dict[str, Any]
+
+    @classmethod
+    def from_profile(cls, profile: Dict[str, Any]) -> "CurrentUser":
+        discord = profile.get("discord") or {}
+        return cls(
+            discord_id=discord["id"],
+            username=discord.get("username"),
+            global_name=discord.get("global_name"),
+            avatar=discord.get("avatar"),
+            profile=profile,
+        )
+
+
+async def get_current_user(
+    request: Request,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+) -> CurrentUser:
+    """
+    The user behind the session cookie, or 401.
+
+    The token check and the profile come from in-process caches (see
+    core.security.verify_jwt_cached and services.users.get_user), so a
+    returning user costs neither crypto nor a database round trip. The
+    context is also left on `request.state.user`.
+    """
+    # set by /auth/discord/callback
+    token = request.cookies.get(settings.SESSION_COOKIE_NAME)
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    try:
+        payload = verify_jwt_cached(token)
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    discord_id = payload.get("sub")
+    profile = await get_user(db, discord_id) if discord_id else None
+    if profile is None:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    user = CurrentUser.from_profile(profile)
+    request.state.user = user
+    return user
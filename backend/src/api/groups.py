@@ -1,15 +1,36 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import base64
+import json
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
 from bson import ObjectId
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pymongo.errors import DuplicateKeyError
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from shared.repositories import GroupRepository, RoleRepository
 
 from ..db.mongo import get_db
-from ..schemas import GroupDB, GroupIn, GroupOut, GroupUpdate, RoleIn
+from ..db.repositories import get_group_repository, get_role_repository
+from ..schemas import (
+    GroupDB,
+    GroupIn,
+    GroupOut,
+    GroupUpdate,
+    RoleIn,
+    role_content_hash,
+)
+from ..schemas.records import (
+    GROUP_PROJECTION,
+    group_adapter,
+    group_record,
+    groups_json,
+)
+from .deps import CurrentUser, get_current_user
 
 router = APIRouter(prefix="/groups", tags=["groups"])
 
@@ -21,125 +42,250 @@ def _clean(s: Optional[str]) -> Optional[str]:
     return s or None
 
 
-@router.get("", response_model=List[GroupOut])
-async def list_groups(db: AsyncIOMotorDatabase = Depends(get_db)):
-    # Fetch full documents so GroupDB / GroupOut see all fields,
-    # including creator_id, items, tags, etc.
-    cursor = db["groups"].find({}).sort("created_at", -1)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# page size once a client asks for pagination (passes `cursor` only)
+DEFAULT_PAGE_SIZE = 100
 
-    out: list[GroupOut] = []
-    async for doc in cursor:
-        db_model = GroupDB.model_validate(doc)  # parse raw Mongo doc
-        out.append(GroupOut.from_db(db_model))
 
-    return out
+def _encode_cursor(created_at: datetime, oid: ObjectId) -> str:
+    raw = json.dumps({"t": created_at.isoformat(), "id": str(oid)})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
 
 
-@router.post("", response_model=GroupOut, status_code=status.HTTP_201_CREATED)
-async def create_group(
-    payload: GroupIn,
+def _decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(raw["t"]), ObjectId(raw["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("", response_model=List[GroupOut])
+async def list_groups(
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        default=None, description=f"Opaque value from the {NEXT_CURSOR_HEADER} header."
+    ),
+    tags: Optional[List[str]] = Query(
+        default=None, description="Only groups that have all of these tags."
+    ),
+    creator_id: Optional[str] = None,
+    name_prefix: Optional[str] = None,
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
-    # normalize creator id
-    creator_id = (payload.creator_id or "").strip() or "unknown"
+    """
+    Newest groups first, keyset-paginated on (created_at, _id).
+
+    Without `limit` and `cursor` every matching group is returned, as
+    before pagination existed. Otherwise at most `limit` (default
+    DEFAULT_PAGE_SIZE) groups come back, and when more are available the
+    response carries an X-Next-Cursor header to pass back as `cursor`.
+    """
+    conditions: list[dict[str, Any]] = []
+    if tags:
+        conditions.append({"tags": {"$all": tags}})
+    if creator_id:
+        conditions.append({"creator_id": creator_id})
+    if name_prefix:
+        # anchored, case-sensitive regex so the name index can be used
+        conditions.append({"name": {"$regex": f"^{re.escape(name_prefix)}"}})
+    if cursor:
+        created_at, oid = _decode_cursor(cursor)
+        conditions.append(
+            {
+                "$or": [
+                    {"created_at": {"$lt": created_at}},
+                    {"created_at": created_at, "_id": {"$lt": oid}},
+                ]
+            }
+        )
 
-    # 1) Create the group first with an empty roles list
-    db_model = GroupDB(
-        name=payload.name.strip(),
-        description=_clean(payload.description),
-        tags=[t.strip() for t in payload.tags if t.strip()],
-        roles=[],
-        creator_id=creator_id,
+    query: dict[str, Any] = {"$and": conditions} if conditions else {}
+    find = db["groups"].find(query, GROUP_PROJECTION).sort(
+        [("created_at", -1), ("_id", -1)]
+    )
+    if limit is None and cursor is None:
+        # unpaginated callers (the frontend group browser) get everything
+        docs = await find.to_list(length=None)
+        return Response(content=groups_json(docs), media_type="application/json")
+
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    docs = await find.limit(limit + 1).to_list(length=limit + 1)
+
+    headers: dict[str, str] = {}
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        headers[NEXT_CURSOR_HEADER] = _encode_cursor(last["created_at"], last["_id"])
+
+    return Response(
+        content=groups_json(docs), media_type="application/json", headers=headers
     )
 
-    res = await db["groups"].insert_one(db_model.model_dump(by_alias=True))
-    inserted = await db["groups"].find_one({"_id": res.inserted_id})
-    if not inserted:
-        raise HTTPException(
-            status_code=500, detail="Failed to create group document in database"
-        )
 
-    group = GroupDB.model_validate(inserted)
+def _same_role(existing: dict[str, Any], normalized_doc: dict[str, Any]) -> bool:
+    return (
+        existing.get("name") == normalized_doc["name"]
+        and existing.get("description") == normalized_doc["description"]
+        and existing.get("role_type") == normalized_doc["role_type"]
+        and (existing.get("items") or {}) == normalized_doc["items"]
+    )
 
-    # 2) Process roles: reuse identical roles, version changed ones
-    role_uuids: list[str] = []
 
+async def _insert_new_roles(
+    roles: RoleRepository, docs: list[dict[str, Any]]
+) -> dict[str, str]:
+    """
+    Insert new role versions in one round trip.
+
+    If a concurrent request stored the same content first, the unique
+    content_hash index rejects our copy and we reuse theirs. Returns
+    {our uuid: stored uuid} for those.
+    """
+    replaced: dict[str, str] = {}
+    try:
+        await roles.collection.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        if not write_errors or any(err.get("code") != 11000 for err in write_errors):
+            raise
+        failed = [docs[err["index"]] for err in write_errors]
+        stored = await roles.find_by_content_hash(d["content_hash"] for d in failed)
+        for doc in failed:
+            winner = stored.get(doc["content_hash"])
+            if winner is None:
+                # duplicate uuid rather than duplicate content
+                raise HTTPException(status_code=409, detail="Role uuid conflict")
+            replaced[doc["uuid"]] = winner["uuid"]
+
+    for doc in docs:
+        if doc["uuid"] not in replaced:
+            roles.remember(doc)
+    return replaced
+
+
+@router.post("", response_model=GroupOut, status_code=status.HTTP_201_CREATED)
+async def create_group(
+    payload: GroupIn,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    roles: RoleRepository = Depends(get_role_repository),
+    user: CurrentUser = Depends(get_current_user),
+):
+    # the session decides who created it, not the request body
+    creator_id = user.discord_id
+
+    # 1) Normalize + hash roles, skipping completely empty ones
+    normalized: list[tuple[RoleIn, dict[str, Any]]] = []
     for raw_role in payload.roles:
         role = RoleIn.model_validate(raw_role)
 
         name = role.name.strip()
         if not name:
-            # skip completely empty roles just in case
             continue
 
-        normalized_doc = {
+        doc: dict[str, Any] = {
             "name": name,
             "description": _clean(role.description),
             "role_type": role.role_type.strip(),
             "items": role.items or {},
             "creator_id": creator_id,
         }
+        doc["content_hash"] = role_content_hash(
+            doc["name"], doc["description"], doc["role_type"], doc["items"]
+        )
+        normalized.append((role, doc))
+
+    # 2) Identical roles already stored, by content hash (one indexed query)
+    by_hash = await roles.find_by_content_hash(
+        doc["content_hash"] for _, doc in normalized
+    )
 
-        existing = None
-        if role.uuid:
-            existing = await db["roles"].find_one({"uuid": role.uuid})
-
-        if existing:
-            # Compare all relevant fields
-            same = (
-                existing.get("name") == normalized_doc["name"]
-                and existing.get("description") == normalized_doc["description"]
-                and existing.get("role_type") == normalized_doc["role_type"]
-                and (existing.get("items") or {}) == normalized_doc["items"]
-            )
-
-            if same:
-                # 2a) Completely identical → reuse existing uuid, no new doc
-                role_uuid = existing["uuid"]
-            else:
-                # 2b) Something changed → create a *new* version with fresh uuid
-                role_uuid = str(uuid4())
-                await db["roles"].insert_one(
-                    {
-                        "uuid": role_uuid,
-                        **normalized_doc,
-                    }
-                )
+    # Roles stored before hashes existed can still be reused by uuid
+    existing_by_uuid = await roles.get_many(
+        role.uuid
+        for role, doc in normalized
+        if role.uuid and doc["content_hash"] not in by_hash
+    )
+
+    # 3) Reuse identical roles, version changed ones (all in memory)
+    role_uuids: list[str] = []
+    new_roles: dict[str, dict[str, Any]] = {}  # content_hash -> doc
+
+    for role, normalized_doc in normalized:
+        content_hash = normalized_doc["content_hash"]
+        known = by_hash.get(content_hash) or new_roles.get(content_hash)
+        if known:
+            # 3a) same content already exists → reuse its uuid
+            role_uuids.append(known["uuid"])
+            continue
+
+        existing = existing_by_uuid.get(role.uuid) if role.uuid else None
+        if existing and _same_role(existing, normalized_doc):
+            # 3b) identical legacy role without a hash → reuse uuid
+            role_uuids.append(existing["uuid"])
+            continue
+
+        # 3c) changed or unknown → new version; keep the client uuid only if free
+        taken = {d["uuid"] for d in new_roles.values()}
+        if role.uuid and not existing and role.uuid not in taken:
+            role_uuid = role.uuid
         else:
-            # 2c) No existing role with this uuid → treat as new role
-            role_uuid = role.uuid or str(uuid4())
-            await db["roles"].insert_one(
-                {
-                    "uuid": role_uuid,
-                    **normalized_doc,
-                }
-            )
+            role_uuid = str(uuid4())
 
+        new_roles[content_hash] = {"uuid": role_uuid, **normalized_doc}
         role_uuids.append(role_uuid)
 
-    # 3) Attach role uuids to the group
-    if role_uuids:
-        await db["groups"].update_one(
-            {"_id": group.id},
-            {"$set": {"roles": role_uuids}},
-        )
-        updated = await db["groups"].find_one({"_id": group.id})
-        if updated:
-            group = GroupDB.model_validate(updated)
+    if new_roles:
+        replaced = await _insert_new_roles(roles, list(new_roles.values()))
+        role_uuids = [replaced.get(u, u) for u in role_uuids]
 
-    return GroupOut.from_db(group)
+    # 4) Insert the group with its final roles list
+    db_model = GroupDB(
+        name=payload.name.strip(),
+        description=_clean(payload.description),
+        tags=[t.strip() for t in payload.tags if t.strip()],
+        roles=role_uuids,
+        creator_id=creator_id,
+    )
+    await db["groups"].insert_one(db_model.model_dump(by_alias=True))
+
+    return GroupOut.from_db(db_model)
 
 
 @router.get("/{uuid}", response_model=GroupOut)
 async def get_group_by_uuid(
     uuid: str,
-    db: AsyncIOMotorDatabase = Depends(get_db),
+    groups: GroupRepository = Depends(get_group_repository),
 ):
-    doc = await db["groups"].find_one({"uuid": uuid})
+    doc = await groups.get(uuid)
     if not doc:
         raise HTTPException(status_code=404, detail="Group not found")
 
-    return GroupOut.from_db(GroupDB.model_validate(doc))
+    return Response(
+        content=group_adapter.dump_json(group_record(doc)),
+        media_type="application/json",
+    )
+
+
+async def _check_owner(
+    db: AsyncIOMotorDatabase, group_id: str, user: CurrentUser
+) -> ObjectId:
+    """
+    404 unless the group exists, 403 unless `user` created it.
+    """
+    if not ObjectId.is_valid(group_id):
+        raise HTTPException(status_code=400, detail="Invalid group id")
+
+    oid = ObjectId(group_id)
+    doc = await db["groups"].find_one({"_id": oid}, {"creator_id": 1})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Group not found")
+    if doc.get("creator_id") != user.discord_id:
+        raise HTTPException(
+            status_code=403, detail="Only the group's creator can change it"
+        )
+    return oid
 
 
 @router.patch("/{group_id}", response_model=GroupOut)
@@ -147,9 +293,10 @@ async def update_group(
     group_id: str,
     patch: GroupUpdate,
     db: AsyncIOMotorDatabase = Depends(get_db),
+    groups: GroupRepository = Depends(get_group_repository),
+    user: CurrentUser = Depends(get_current_user),
 ):
-    if not ObjectId.is_valid(group_id):
-        raise HTTPException(status_code=400, detail="Invalid group id")
+    oid = await _check_owner(db, group_id, user)
 
     update_doc: Dict[str, object] = {}
 
@@ -161,18 +308,16 @@ async def update_group(
         update_doc["tags"] = [t.strip() for t in patch.tags if t.strip()]
     if patch.roles is not None:
         update_doc["roles"] = patch.roles
-    if patch.creator_id is not None:
-        update_doc["creator_id"] = patch.creator_id.strip()
 
     if not update_doc:
-        doc = await db["groups"].find_one({"_id": ObjectId(group_id)})
+        doc = await db["groups"].find_one({"_id": oid})
         if not doc:
             raise HTTPException(status_code=404, detail="Group not found")
         return GroupOut.from_db(GroupDB.model_validate(doc))
 
     try:
         await db["groups"].update_one(
-            {"_id": ObjectId(group_id)},
+            {"_id": oid},
             {"$set": update_doc},
         )
     except DuplicateKeyError:
@@ -181,10 +326,13 @@ async def update_group(
             detail="Group name already exists",
         )
 
-    doc = await db["groups"].find_one({"_id": ObjectId(group_id)})
+    doc = await db["groups"].find_one({"_id": oid})
     if not doc:
         raise HTTPException(status_code=404, detail="Group not found")
 
+    # PATCHed role lists must show up immediately
+    groups.invalidate(doc["uuid"])
+
     return GroupOut.from_db(GroupDB.model_validate(doc))
 
 
@@ -192,12 +340,16 @@ async def update_group(
 async def delete_group(
     group_id: str,
     db: AsyncIOMotorDatabase = Depends(get_db),
+    groups: GroupRepository = Depends(get_group_repository),
+    user: CurrentUser = Depends(get_current_user),
 ):
-    if not ObjectId.is_valid(group_id):
-        raise HTTPException(status_code=400, detail="Invalid group id")
+    oid = await _check_owner(db, group_id, user)
 
-    res = await db["groups"].delete_one({"_id": ObjectId(group_id)})
-    if res.deleted_count == 0:
+    deleted = await db["groups"].find_one_and_delete(
+        {"_id": oid}, projection={"uuid": 1}
+    )
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Group not found")
 
+    groups.invalidate(deleted["uuid"])
     return
@@ -1,55 +1,137 @@
 from __future__ import annotations
 
-from typing import List
+import logging
+import re
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pymongo.errors import DuplicateKeyError
 
 from ..db.mongo import get_db
-from ..schemas import ItemIn, ItemOut
+from ..schemas import ItemImportReport, ItemIn, ItemOut, ItemSeedResult
+from ..services.item_catalog import (
+    SEED_CHUNK_SIZE,
+    ImportFormat,
+    add_batch,
+    catalog_cache,
+    format_from_content_type,
+    import_items,
+    item_to_out,
+    parse_rows,
+    upsert_items,
+)
+from .deps import get_current_user
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/items", tags=["items"])
 
 
-def _to_out(doc) -> ItemOut:
-    return ItemOut(
-        id=str(doc["_id"]),
-        item_db_name=doc["item_db_name"],
-        item_name=doc["item_name"],
-        item_category_main=doc["item_category_main"],
-        item_category_second=doc["item_category_second"],
-    )
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    # weak comparison, as required for If-None-Match
+    return "*" in tags or any(t.removeprefix("W/") == etag for t in tags)
+
+
+# matches the (item_category_main, item_category_second, item_name) index
+CATALOG_SORT = [
+    ("item_category_main", 1),
+    ("item_category_second", 1),
+    ("item_name", 1),
+]
 
 
 @router.get("/", response_model=List[ItemOut])
-async def list_items(db: AsyncIOMotorDatabase = Depends(get_db)):
-    cursor = db.items.find({})
-    results: list[ItemOut] = []
-    async for doc in cursor:
-        results.append(_to_out(doc))
-    return results
+async def list_items(
+    request: Request,
+    item_category_main: Optional[str] = None,
+    item_category_second: Optional[str] = None,
+    name_prefix: Optional[str] = Query(
+        default=None, description="Case-sensitive prefix of item_name."
+    ),
+    limit: Optional[int] = Query(default=None, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Without query parameters this returns the whole catalog from the
+    in-memory serialized copy (with ETag support). Filters and pagination
+    go to Mongo, ordered by category and name.
+    """
+    query: Dict[str, Any] = {}
+    if item_category_main:
+        query["item_category_main"] = item_category_main
+    if item_category_second:
+        query["item_category_second"] = item_category_second
+    if name_prefix:
+        query["item_name"] = {"$regex": f"^{re.escape(name_prefix)}"}
+
+    if query or limit is not None or offset:
+        cursor = db.items.find(query).sort(CATALOG_SORT).skip(offset)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        return [item_to_out(doc) async for doc in cursor]
+
+    body, etag = await catalog_cache.get(db)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
+    return Response(content=body, media_type="application/json", headers=headers)
 
-@router.post("/seed", response_model=int, status_code=status.HTTP_201_CREATED)
+
+@router.post(
+    "/seed",
+    response_model=ItemSeedResult,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(get_current_user)],
+)
 async def seed_items(
     items: List[ItemIn],
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
-    inserted_count = 0
-
-    for it in items:
-        try:
-            await db.items.insert_one(
-                {
-                    "item_db_name": it.item_db_name,
-                    "item_name": it.item_name,
-                    "item_category_main": it.item_category_main,
-                    "item_category_second": it.item_category_second,
-                }
-            )
-            inserted_count += 1
-        except DuplicateKeyError:
-            continue
-
-    return inserted_count
+    result = await upsert_items(db, items)
+    catalog_cache.bump()
+    return result
+
+
+@router.post(
+    "/import",
+    response_model=ItemImportReport,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(get_current_user)],
+)
+async def import_items_stream(
+    request: Request,
+    format: Optional[ImportFormat] = Query(
+        default=None,
+        description="ndjson or csv; defaults from the Content-Type header.",
+    ),
+    batch_size: int = Query(default=SEED_CHUNK_SIZE, ge=1, le=10_000),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Import items from an NDJSON or CSV request body of any size.
+
+    The body is parsed incrementally and valid rows are upserted every
+    `batch_size` rows; invalid rows are reported with their line number.
+    """
+    fmt = format or format_from_content_type(request.headers.get("content-type"))
+    report = ItemImportReport()
+
+    rows = parse_rows(request.stream(), fmt)
+    async for batch, errors in import_items(db, rows, batch_size):
+        add_batch(report, batch, errors)
+        logger.info(
+            "items import batch %d: %d rows, %d failed (total %d)",
+            batch.batch,
+            batch.rows,
+            batch.failed,
+            report.rows,
+        )
+
+    catalog_cache.bump()
+    return report
@@ -1,49 +1,93 @@
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import AsyncIterator, Literal, Optional
 
 from bson import ObjectId
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from src.schemas.role import RoleDB, RoleOut
+from shared.repositories import RoleRepository
+from src.schemas.role import RoleBatchRequest, RoleOut
 
 from ..db.mongo import get_db
+from ..db.repositories import get_role_repository
+from ..schemas.records import ROLE_PROJECTION, role_adapter, role_record, roles_json
 
 router = APIRouter(prefix="/roles", tags=["roles"])
 
+# documents per cursor batch when streaming the full collection
+STREAM_BATCH_SIZE = 500
+
 
 def _maybe_object_id(s: str) -> Optional[ObjectId]:
     return ObjectId(s) if ObjectId.is_valid(s) else None
 
 
+def _json(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+async def _roles_in_order(roles: RoleRepository, uuids: list[str]) -> Response:
+    # one role per requested uuid, repeats included: identical roles in a
+    # group share a uuid and every slot still needs its entry
+    docs = await roles.get_many(uuids)
+    return _json(roles_json(docs[u] for u in uuids if u in docs))
+
+
+async def _stream_roles_ndjson(db: AsyncIOMotorDatabase) -> AsyncIterator[bytes]:
+    cursor = db["roles"].find({}, ROLE_PROJECTION, batch_size=STREAM_BATCH_SIZE)
+    async for doc in cursor:
+        yield role_adapter.dump_json(role_record(doc)) + b"\n"
+
+
 @router.get("", response_model=list[RoleOut])
 async def list_roles(
     uuids: str | None = None,
+    format: Literal["json", "ndjson"] = Query(
+        default="json",
+        description="ndjson streams the unfiltered listing one role per line.",
+    ),
     db: AsyncIOMotorDatabase = Depends(get_db),
+    roles: RoleRepository = Depends(get_role_repository),
 ):
-    query: dict[str, Any] = {}
     if uuids:
-        uuid_list = [u.strip() for u in uuids.split(",") if u.strip()]
-        query["uuid"] = {"$in": uuid_list}
+        return await _roles_in_order(
+            roles, [u.strip() for u in uuids.split(",") if u.strip()]
+        )
 
-    cursor = db["roles"].find(query)
-    out: list[RoleOut] = []
-    async for doc in cursor:
-        db_model = RoleDB.model_validate(doc)
-        out.append(RoleOut.from_db(db_model))
-    return out
+    if format == "ndjson":
+        return StreamingResponse(
+            _stream_roles_ndjson(db), media_type="application/x-ndjson"
+        )
+
+    docs = await db["roles"].find({}, ROLE_PROJECTION).to_list(length=None)
+    return _json(roles_json(docs))
+
+
+@router.post("/batch", response_model=list[RoleOut])
+async def list_roles_batch(
+    payload: RoleBatchRequest,
+    roles: RoleRepository = Depends(get_role_repository),
+):
+    """
+    Same as GET /roles?uuids=..., but takes the UUIDs in the body so large
+    party lists don't hit URL length limits. Resolved with one `$in` query
+    (minus whatever is cached).
+    """
+    return await _roles_in_order(
+        roles, [u.strip() for u in payload.uuids if u.strip()]
+    )
 
 
 @router.get("/{uuid}", response_model=RoleOut)
 async def get_role_by_uuid(
     uuid: str,
-    db: AsyncIOMotorDatabase = Depends(get_db),
+    roles: RoleRepository = Depends(get_role_repository),
 ):
     # Find a single role document by its UUID field
-    doc = await db["roles"].find_one({"uuid": uuid})
+    doc = await roles.get(uuid)
     if not doc:
         raise HTTPException(status_code=404, detail="Role not found")
 
-    db_model = RoleDB.model_validate(doc)
-    return RoleOut.from_db(db_model)
+    return _json(role_adapter.dump_json(role_record(doc)))
@@ -0,0 +1,78 @@
+"""
+Stream an NDJSON or CSV item catalog file into the items collection.
+
+Usage (from the backend directory):
+
+    python -m src.cli.import_items items.ndjson
+    python -m src.cli.import_items items.csv --batch-size 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from ..db.mongo import get_db
+from ..schemas import ItemImportReport
+from ..services.item_catalog import (
+    SEED_CHUNK_SIZE,
+    ImportFormat,
+    add_batch,
+    import_items,
+    parse_rows,
+)
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+async def _read_chunks(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as f:
+        while chunk := f.read(READ_CHUNK_SIZE):
+            yield chunk
+
+
+async def run(path: Path, fmt: ImportFormat, batch_size: int) -> ItemImportReport:
+    db = get_db()
+    report = ItemImportReport()
+
+    rows = parse_rows(_read_chunks(path), fmt)
+    async for batch, errors in import_items(db, rows, batch_size):
+        add_batch(report, batch, errors)
+        print(
+            f"batch {batch.batch}: {batch.rows} rows "
+            f"(+{batch.inserted} new, {batch.updated} updated, "
+            f"{batch.skipped} skipped, {batch.failed} failed) "
+            f"- total {report.rows}"
+        )
+        for err in errors:
+            print(f"  line {err.line}: {err.error}")
+
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Import items from NDJSON / CSV.")
+    parser.add_argument("path", type=Path)
+    parser.add_argument(
+        "--format",
+        choices=["ndjson", "csv"],
+        help="defaults from the file extension",
+    )
+    parser.add_argument("--batch-size", type=int, default=SEED_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    fmt: ImportFormat = args.format or (
+        "csv" if args.path.suffix.lower() == ".csv" else "ndjson"
+    )
+    report = asyncio.run(run(args.path, fmt, args.batch_size))
+    print(
+        f"Done: {report.rows} rows, {report.inserted} inserted, "
+        f"{report.updated} updated, {report.skipped} skipped, "
+        f"{report.failed} failed."
+    )
+
+
+if __name__ == "__main__":
+    main()
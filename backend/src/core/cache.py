@@ -0,0 +1,24 @@
+from shared.cache import TTLCache
+
+from .settings import settings
+
+# Group / role definitions keyed by uuid (raw Mongo documents).
+# Roles never change once written (edits create a new uuid), groups can be
+# PATCHed, so the group handlers invalidate on write.
+group_cache: TTLCache[str, dict] = TTLCache(
+    maxsize=settings.CACHE_MAX_ENTRIES, ttl=settings.CACHE_GROUP_TTL_SECONDS
+)
+role_cache: TTLCache[str, dict] = TTLCache(
+    maxsize=settings.CACHE_MAX_ENTRIES, ttl=settings.CACHE_ROLE_TTL_SECONDS
+)
+
+# Session JWT payloads keyed by sha256(token), and user profiles keyed by
+# Discord id. Both are bounded so a flood of distinct tokens can't grow them.
+token_cache: TTLCache[str, dict] = TTLCache(
+    maxsize=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_TOKEN_CACHE_TTL_SECONDS,
+)
+user_cache: TTLCache[str, dict] = TTLCache(
+    maxsize=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
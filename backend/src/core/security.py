@@ -1,7 +1,10 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 
 from jose import jwt
 
+from .cache import token_cache
 from .settings import settings
 
 
@@ -17,3 +20,20 @@ def create_jwt(sub: str) -> str:
 
 def verify_jwt(token: str) -> dict:
     return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
+
+
+def verify_jwt_cached(token: str) -> dict:
+    """
+    verify_jwt, remembering tokens that verified successfully until their
+    `exp` (or the cache TTL, whichever comes first). Failures are not cached.
+    """
+    key = hashlib.sha256(token.encode()).hexdigest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = verify_jwt(token)
+    remaining = payload.get("exp", 0) - time.time()
+    if remaining > 0:
+        token_cache.set(key, payload, ttl=remaining)
+    return payload
@@ -18,15 +18,50 @@ class Settings(BaseSettings):
     DISCORD_CLIENT_ID: Optional[str] = None
     DISCORD_CLIENT_SECRET: Optional[str] = None
     DISCORD_REDIRECT_URI: Optional[str] = None
+    # point at a local stub server in tests
+    DISCORD_API_BASE: str = "https://discord.com/api"
+
+    # --- Outbound HTTP (one pooled client per process) ---
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    # needs the h2 package (httpx[http2]); HTTP/1.1 keep-alive otherwise
+    HTTP2_ENABLED: bool = True
 
     # --- Mongo ---
     MONGODB_URI: Optional[str] = None
     MONGODB_DB: str = "discord_content_bot"
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 10  # opened and warmed at startup
+    MONGODB_MAX_IDLE_TIME_MS: Optional[int] = 300_000
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5_000
+    MONGODB_CONNECT_TIMEOUT_MS: int = 5_000
+    MONGODB_SOCKET_TIMEOUT_MS: Optional[int] = 20_000
+    # comma separated, e.g. "zstd,snappy"; needs the zstandard / python-snappy
+    # packages installed, otherwise pymongo ignores the compressor
+    MONGODB_COMPRESSORS: Optional[str] = None
+    MONGODB_READ_PREFERENCE: Literal[
+        "primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"
+    ] = "primary"
+
+    # --- In-process cache for group / role definitions ---
+    CACHE_MAX_ENTRIES: int = 10_000
+    CACHE_GROUP_TTL_SECONDS: float = 60.0
+    CACHE_ROLE_TTL_SECONDS: float = 3600.0
+    # serialized GET /items body is rebuilt at least this often
+    ITEMS_CATALOG_MAX_AGE_SECONDS: float = 300.0
 
     # --- JWT ---
     JWT_SECRET: Optional[str] = None
     JWT_ALG: str = "HS256"
     JWT_EXPIRE_DAYS: int = 7
+    # verified tokens are cached by hash, never past their `exp`
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+    AUTH_TOKEN_CACHE_TTL_SECONDS: float = 300.0
+    # user profiles (users collection), invalidated on login
+    AUTH_USER_CACHE_TTL_SECONDS: float = 30.0
 
     # --- CORS / Frontend ---
     FRONTEND_ORIGIN: str = "http://localhost:3000"
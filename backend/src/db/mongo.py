@@ -1,17 +1,49 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from shared.mongo import MongoConfig, create_client, warm_pool
+
 from ..core.settings import settings
 from .typing import Optional
 
 _client: Optional[AsyncIOMotorClient] = None
 
 
+def mongo_config() -> MongoConfig:
+    return MongoConfig(
+        uri=settings.MONGODB_URI or MongoConfig.uri,
+        db_name=settings.MONGODB_DB,
+        max_pool_size=settings.MONGODB_MAX_POOL_SIZE,
+        min_pool_size=settings.MONGODB_MIN_POOL_SIZE,
+        max_idle_time_ms=settings.MONGODB_MAX_IDLE_TIME_MS,
+        server_selection_timeout_ms=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        connect_timeout_ms=settings.MONGODB_CONNECT_TIMEOUT_MS,
+        socket_timeout_ms=settings.MONGODB_SOCKET_TIMEOUT_MS,
+        compressors=settings.MONGODB_COMPRESSORS,
+        read_preference=settings.MONGODB_READ_PREFERENCE,
+    )
+
+
 def get_client() -> AsyncIOMotorClient:
     global _client
     if _client is None:
-        _client = AsyncIOMotorClient(settings.MONGODB_URI)
+        _client = create_client(mongo_config())
     return _client
 
 
 def get_db():
     return get_client()[settings.MONGODB_DB]
+
+
+async def connect() -> None:
+    """
+    Create the client and warm the pool so the first requests don't pay for
+    server selection and connection handshakes.
+    """
+    await warm_pool(get_client(), settings.MONGODB_MIN_POOL_SIZE)
+
+
+def close_client() -> None:
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
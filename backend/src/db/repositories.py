@@ -0,0 +1,19 @@
+from fastapi import Depends
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from shared.repositories import GroupRepository, RoleRepository
+
+from ..core.cache import group_cache, role_cache
+from .mongo import get_db
+
+
+def get_group_repository(
+    db: AsyncIOMotorDatabase = Depends(get_db),
+) -> GroupRepository:
+    return GroupRepository(db, group_cache)
+
+
+def get_role_repository(
+    db: AsyncIOMotorDatabase = Depends(get_db),
+) -> RoleRepository:
+    return RoleRepository(db, role_cache)
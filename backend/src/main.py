@@ -1,20 +1,45 @@
+import logging
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
+from shared.migrations import MigrationError, run_migrations
+
 from .api.auth.discord import router as discord_router
+from .api.groups import NEXT_CURSOR_HEADER
 from .api.groups import router as groups_router
 from .api.items import router as items_router
 from .api.roles import router as roles_router
+from .core.cache import group_cache, role_cache, token_cache, user_cache
+from .core.http import close_http_client, get_http_client
 from .core.settings import settings
-from .db.mongo import get_db
+from .db.mongo import close_client, connect, get_db
 
 SESSION_COOKIE_NAME = os.getenv("SESSION_COOKIE_NAME", "session")
 FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN", "http://localhost:3000")
 
-app = FastAPI(title="DiscordContentBotWebApp API")
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await connect()
+    try:
+        await run_migrations(get_db())
+    except MigrationError as e:
+        # the routes still work without the pending indexes (slower, and
+        # without their uniqueness guarantees); retried on the next start
+        logger.error("%s; starting without it", e)
+    get_http_client()
+    yield
+    await close_http_client()
+    close_client()
+
+
+app = FastAPI(title="DiscordContentBotWebApp API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.add_middleware(
@@ -39,15 +65,17 @@ async def health():
     return {"ok": True}
 
 
+@app.get("/health/cache")
+async def cache_stats():
+    return {
+        "groups": group_cache.stats(),
+        "roles": role_cache.stats(),
+        "tokens": token_cache.stats(),
+        "users": user_cache.stats(),
+    }
+
+
 app.include_router(discord_router)
 app.include_router(groups_router)
 app.include_router(items_router)
 app.include_router(roles_router)
-
-
-@app.on_event("startup")
-async def init_indexes():
-    db = get_db()
-    await db["users"].create_index("discord.id", unique=True)
-    await db["groups"].create_index("uuid", unique=True)
-    await db["roles"].create_index("uuid", unique=True)
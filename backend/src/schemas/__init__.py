@@ -1,7 +1,15 @@
 from .bson import PyObjectId
 from .group import GroupDB, GroupIn, GroupOut, GroupUpdate
-from .item import ItemDB, ItemIn, ItemOut
-from .role import RoleDB, RoleIn, RoleOut
+from .item import (
+    ItemDB,
+    ItemImportBatch,
+    ItemImportReport,
+    ItemImportRowError,
+    ItemIn,
+    ItemOut,
+    ItemSeedResult,
+)
+from .role import RoleBatchRequest, RoleDB, RoleIn, RoleOut, role_content_hash
 
 __all__ = [
     "PyObjectId",
@@ -12,7 +20,13 @@ __all__ = [
     "ItemIn",
     "ItemDB",
     "ItemOut",
+    "ItemSeedResult",
+    "ItemImportBatch",
+    "ItemImportReport",
+    "ItemImportRowError",
     "RoleIn",
     "RoleDB",
     "RoleOut",
+    "RoleBatchRequest",
+    "role_content_hash",
 ]
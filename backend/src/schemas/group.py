@@ -20,11 +20,11 @@ class GroupIn(BaseModel):
     # full role configs, will be converted to role UUIDs in DB
     roles: List[RoleIn] = Field(default_factory=list)
 
-    # Discord user id of the creator
+    # ignored: the creator is the authenticated user
     creator_id: Optional[str] = Field(
         default=None,
         max_length=64,
-        description="Discord user id of the user who created this group.",
+        description="Ignored; the creator is taken from the session.",
     )
 
 
@@ -36,6 +36,7 @@ class GroupUpdate(BaseModel):
     # for now we only support replacing the list of role UUIDs via PATCH
     roles: Optional[List[str]] = None
 
+    # ignored: groups can't be reassigned through the API
     creator_id: Optional[str] = Field(default=None, max_length=64)
 
 
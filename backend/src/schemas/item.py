@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import List
+
 from bson import ObjectId
 from pydantic import BaseModel, Field
 
@@ -45,3 +47,36 @@ class ItemOut(BaseModel):
     item_name: str
     item_category_main: str
     item_category_second: str
+
+
+class ItemSeedResult(BaseModel):
+    inserted: int = Field(0, description="New items added to the catalog.")
+    updated: int = Field(0, description="Existing items whose fields changed.")
+    skipped: int = Field(
+        0, description="Unchanged items and duplicates within the payload."
+    )
+
+
+class ItemImportRowError(BaseModel):
+    line: int = Field(..., description="1-based line number in the uploaded file.")
+    error: str
+
+
+class ItemImportBatch(ItemSeedResult):
+    batch: int
+    rows: int = Field(0, description="Valid rows written in this batch.")
+    failed: int = Field(0, description="Rows rejected while filling this batch.")
+
+
+class ItemImportReport(ItemSeedResult):
+    rows: int = 0
+    failed: int = 0
+    batch_count: int = 0
+    batches: List[ItemImportBatch] = Field(
+        default_factory=list,
+        description="The most recent batches (only the last few are kept).",
+    )
+    errors: List[ItemImportRowError] = Field(
+        default_factory=list,
+        description="Row-level errors (only the first few hundred are kept).",
+    )
@@ -0,0 +1,102 @@
+"""
+Fast read path for GET endpoints.
+
+Mongo documents are projected to the public fields, `_id` is converted once,
+and the result is serialized straight to JSON bytes by a precompiled
+TypeAdapter. Unlike the GroupDB -> GroupOut -> response_model route, nothing
+is validated on the way out: data coming from our own collections was
+validated when it was written.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+from shared.repositories import GROUP_PROJECTION, ROLE_PROJECTION
+
+__all__ = [
+    "GROUP_PROJECTION",
+    "ROLE_PROJECTION",
+    "GroupRecord",
+    "RoleRecord",
+    "group_record",
+    "role_record",
+    "group_adapter",
+    "group_list_adapter",
+    "role_adapter",
+    "role_list_adapter",
+    "groups_json",
+    "roles_json",
+]
+
+
+class GroupRecord(TypedDict):
+    """Same shape as GroupOut."""
+
+    id: str
+    uuid: str
+    name: str
+    description: Optional[str]
+    tags: List[str]
+    roles: List[str]
+    creator_id: Optional[str]
+    created_at: datetime
+
+
+class RoleRecord(TypedDict):
+    """Same shape as RoleOut."""
+
+    id: str
+    uuid: str
+    name: str
+    description: Optional[str]
+    role_type: str
+    items: Dict[str, Optional[str]]
+    creator_id: Optional[str]
+    created_at: datetime
+
+
+def group_record(doc: Dict[str, Any]) -> GroupRecord:
+    # defaults mirror GroupDB
+    return {
+        "id": str(doc["_id"]),
+        "uuid": doc["uuid"],
+        "name": doc["name"],
+        "description": doc.get("description", ""),
+        "tags": doc.get("tags") or [],
+        "roles": doc.get("roles") or [],
+        "creator_id": doc.get("creator_id"),
+        "created_at": doc.get("created_at") or datetime.utcnow(),
+    }
+
+
+def role_record(doc: Dict[str, Any]) -> RoleRecord:
+    # defaults mirror RoleDB
+    return {
+        "id": str(doc["_id"]),
+        "uuid": doc["uuid"],
+        "name": doc["name"],
+        "description": doc.get("description", ""),
+        "role_type": doc["role_type"],
+        "items": doc.get("items") or {},
+        "creator_id": doc.get("creator_id"),
+        "created_at": doc.get("created_at") or datetime.utcnow(),
+    }
+
+
+group_adapter = TypeAdapter(GroupRecord)
+group_list_adapter = TypeAdapter(List[GroupRecord])
+role_adapter = TypeAdapter(RoleRecord)
+role_list_adapter = TypeAdapter(List[RoleRecord])
+
+
+def groups_json(docs: Iterable[Dict[str, Any]]) -> bytes:
+    return group_list_adapter.dump_json([group_record(d) for d in docs])
+
+
+def roles_json(docs: Iterable[Dict[str, Any]]) -> bytes:
+    return role_list_adapter.dump_json([role_record(d) for d in docs])
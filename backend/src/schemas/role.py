@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from uuid import uuid4
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -9,6 +11,30 @@ from pydantic import BaseModel, ConfigDict, Field
 from .bson import PyObjectId
 
 
+def role_content_hash(
+    name: str,
+    description: Optional[str],
+    role_type: str,
+    items: Dict[str, Optional[str]],
+) -> str:
+    """
+    Canonical hash of what a role *is* (not who made it or when), used to
+    deduplicate identical roles across groups and creators.
+    """
+    canonical = json.dumps(
+        {
+            "name": name,
+            "description": description,
+            "role_type": role_type,
+            "items": items,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
 class RoleIn(BaseModel):
     """
     Payload used when creating / attaching a role to a group.
@@ -37,6 +63,11 @@ class RoleDB(BaseModel):
     role_type: str = Field(min_length=1, max_length=80)
     items: Dict[str, Optional[str]] = Field(default_factory=dict)
 
+    content_hash: Optional[str] = Field(
+        default=None,
+        description="role_content_hash() of name/description/role_type/items.",
+    )
+
     # NEW: who created this role (Discord id)
     creator_id: Optional[str] = Field(
         default=None,
@@ -76,3 +107,11 @@ class RoleOut(BaseModel):
             creator_id=db.creator_id,
             created_at=db.created_at,
         )
+
+
+class RoleBatchRequest(BaseModel):
+    uuids: List[str] = Field(
+        ...,
+        max_length=10_000,
+        description="Role UUIDs to fetch; unknown ones are left out.",
+    )
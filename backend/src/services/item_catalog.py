@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import asyncio
+import codecs
+import csv
+import hashlib
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple, Union
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import TypeAdapter, ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from ..core.settings import settings
+from ..schemas import (
+    ItemImportBatch,
+    ItemImportReport,
+    ItemImportRowError,
+    ItemIn,
+    ItemOut,
+    ItemSeedResult,
+)
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# items per bulk_write round trip
+SEED_CHUNK_SIZE = 1000
+
+# keep the report bounded for files full of bad rows
+MAX_REPORTED_ERRORS = 500
+# per-batch entries kept in the report (the most recent ones); the totals
+# cover every batch
+MAX_REPORTED_BATCHES = 20
+
+# (line number, validated item or error message)
+ParsedRow = Tuple[int, Union[ItemIn, str]]
+
+_items_out_adapter = TypeAdapter(List[ItemOut])
+
+
+def item_to_out(doc: Dict[str, Any]) -> ItemOut:
+    return ItemOut(
+        id=str(doc["_id"]),
+        item_db_name=doc["item_db_name"],
+        item_name=doc["item_name"],
+        item_category_main=doc["item_category_main"],
+        item_category_second=doc["item_category_second"],
+    )
+
+
+class CatalogCache:
+    """
+    Serialized GET /items body plus its ETag, rebuilt only after the catalog
+    version is bumped (seed / import) or the snapshot is older than max_age.
+
+    The age limit bounds staleness when another API replica seeds the catalog.
+    """
+
+    def __init__(self, max_age: float) -> None:
+        self.max_age = max_age
+        self.version = 0
+        self._built_version = -1
+        self._built_at = 0.0
+        self._body = b""
+        self._etag = ""
+        self._lock = asyncio.Lock()
+
+    def bump(self) -> None:
+        self.version += 1
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._built_version == self.version
+            and time.monotonic() - self._built_at < self.max_age
+        )
+
+    async def get(self, db: AsyncIOMotorDatabase) -> Tuple[bytes, str]:
+        """
+        Returns (json body, etag), hitting Mongo only when stale.
+        """
+        if self._is_fresh():
+            return self._body, self._etag
+
+        async with self._lock:
+            # another request may have rebuilt it while we waited
+            if self._is_fresh():
+                return self._body, self._etag
+
+            version = self.version
+            items = [item_to_out(doc) async for doc in db.items.find({})]
+            body = _items_out_adapter.dump_json(items)
+
+            self._body = body
+            # content hash, so replicas serving the same catalog agree
+            self._etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            self._built_version = version
+            self._built_at = time.monotonic()
+            return self._body, self._etag
+
+
+catalog_cache = CatalogCache(max_age=settings.ITEMS_CATALOG_MAX_AGE_SECONDS)
+
+
+async def upsert_items(
+    db: AsyncIOMotorDatabase, items: List[ItemIn]
+) -> ItemSeedResult:
+    """
+    Upsert items keyed by item_db_name with unordered bulk writes.
+    """
+    result = ItemSeedResult()
+
+    unique: Dict[str, ItemIn] = {}
+    for it in items:
+        if it.item_db_name in unique:
+            result.skipped += 1
+            continue
+        unique[it.item_db_name] = it
+
+    ops = [
+        UpdateOne(
+            {"item_db_name": it.item_db_name},
+            {
+                "$set": {
+                    "item_name": it.item_name,
+                    "item_category_main": it.item_category_main,
+                    "item_category_second": it.item_category_second,
+                }
+            },
+            upsert=True,
+        )
+        for it in unique.values()
+    ]
+
+    for start in range(0, len(ops), SEED_CHUNK_SIZE):
+        await _bulk_upsert(db, ops[start : start + SEED_CHUNK_SIZE], result)
+
+    return result
+
+
+async def _bulk_upsert(
+    db: AsyncIOMotorDatabase,
+    ops: List[UpdateOne],
+    result: ItemSeedResult,
+    retry: bool = True,
+) -> None:
+    """
+    Run one chunk of upserts and add its counts to `result`.
+
+    Two seeds / imports upserting the same new item_db_name at once make
+    one of the inserts fail on the unique index (11000). The document
+    exists by then, so those ops are retried once as plain updates.
+    """
+    try:
+        res = await db.items.bulk_write(ops, ordered=False)
+    except BulkWriteError as e:
+        details = e.details
+        write_errors = details.get("writeErrors", [])
+        if not retry or any(err.get("code") != 11000 for err in write_errors):
+            raise
+        result.inserted += details.get("nUpserted", 0)
+        result.updated += details.get("nModified", 0)
+        result.skipped += details.get("nMatched", 0) - details.get("nModified", 0)
+        retried = [ops[err["index"]] for err in write_errors]
+        await _bulk_upsert(db, retried, result, retry=False)
+        return
+
+    result.inserted += res.upserted_count
+    result.updated += res.modified_count
+    result.skipped += res.matched_count - res.modified_count
+
+
+def format_from_content_type(content_type: Optional[str]) -> ImportFormat:
+    if content_type and "csv" in content_type.lower():
+        return "csv"
+    return "ndjson"
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a byte stream into text lines without buffering more than one line.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def _validate(line_no: int, raw: Any) -> ParsedRow:
+    try:
+        return line_no, ItemIn.model_validate(raw)
+    except ValidationError as e:
+        msg = "; ".join(
+            f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}"
+            for err in e.errors()
+        )
+        return line_no, msg
+
+
+async def iter_ndjson_rows(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRow]:
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            raw = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, f"invalid JSON: {e.msg}"
+            continue
+        yield _validate(line_no, raw)
+
+
+async def iter_csv_rows(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRow]:
+    """
+    CSV with a header row naming the ItemIn fields. Each record must fit on
+    one line (quoted fields may contain commas, not newlines).
+    """
+    header: Optional[List[str]] = None
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            values = next(csv.reader([line]))
+        except csv.Error as e:
+            yield line_no, f"invalid CSV: {e}"
+            continue
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        if len(values) != len(header):
+            yield line_no, f"expected {len(header)} columns, got {len(values)}"
+            continue
+        yield _validate(line_no, dict(zip(header, values)))
+
+
+def parse_rows(
+    chunks: AsyncIterator[bytes], fmt: ImportFormat
+) -> AsyncIterator[ParsedRow]:
+    lines = iter_lines(chunks)
+    if fmt == "csv":
+        return iter_csv_rows(lines)
+    return iter_ndjson_rows(lines)
+
+
+async def import_items(
+    db: AsyncIOMotorDatabase,
+    rows: AsyncIterator[ParsedRow],
+    batch_size: int = SEED_CHUNK_SIZE,
+) -> AsyncIterator[Tuple[ItemImportBatch, List[ItemImportRowError]]]:
+    """
+    Consume parsed rows and flush valid ones to Mongo every `batch_size` rows.
+
+    Yields one (batch report, row errors) pair per flushed batch, so memory
+    stays bounded by the batch size however large the input is.
+    """
+    batch_no = 0
+    items: List[ItemIn] = []
+    errors: List[ItemImportRowError] = []
+
+    async def flush() -> ItemImportBatch:
+        nonlocal batch_no
+        batch_no += 1
+        res = await upsert_items(db, items) if items else ItemSeedResult()
+        return ItemImportBatch(
+            batch=batch_no,
+            rows=len(items),
+            failed=len(errors),
+            **res.model_dump(),
+        )
+
+    async for line_no, parsed in rows:
+        if isinstance(parsed, str):
+            errors.append(ItemImportRowError(line=line_no, error=parsed))
+        else:
+            items.append(parsed)
+
+        if len(items) + len(errors) >= batch_size:
+            yield await flush(), errors
+            items, errors = [], []
+
+    if items or errors:
+        yield await flush(), errors
+
+
+def add_batch(
+    report: ItemImportReport,
+    batch: ItemImportBatch,
+    errors: List[ItemImportRowError],
+) -> None:
+    """
+    Fold one batch into the running totals of an import report.
+    """
+    report.rows += batch.rows
+    report.failed += batch.failed
+    report.inserted += batch.inserted
+    report.updated += batch.updated
+    report.skipped += batch.skipped
+    report.batch_count += 1
+    report.batches.append(batch)
+    if len(report.batches) > MAX_REPORTED_BATCHES:
+        del report.batches[0]
+    room = MAX_REPORTED_ERRORS - len(report.errors)
+    if room > 0:
+        report.errors.extend(errors[:room])
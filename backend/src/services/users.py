@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..core.cache import user_cache
+
+
+async def get_user(
+    db: AsyncIOMotorDatabase, discord_id: str
+) -> Optional[Dict[str, Any]]:
+    """
+    User profile by Discord id, read through the short-lived user cache.
+    Unknown users are not cached, so a later login is seen immediately.
+    """
+    user = user_cache.get(discord_id)
+    if user is None:
+        user = await db["users"].find_one({"discord.id": discord_id}, {"_id": 0})
+        if user is not None:
+            user_cache.set(discord_id, user)
+    return user
+
+
+def invalidate_user(discord_id: str) -> None:
+    user_cache.invalidate(discord_id)
@@ -0,0 +1,162 @@
+"""
+Content encode / decode throughput and per-object memory.
+
+"before" replays the previous model: a regular (dict-backed) dataclass,
+to_document via dataclasses.asdict and decoding field by field with eager
+defaults. "after" is content_service.Content: slots=True,
+to_document / from_document.
+
+Documents are generated in memory (40 members per content); no database
+needed. The assignment index is built on first use; "after+index" decodes
+and builds it, as a full display rebuild does (patched renders parse only
+the changed slot keys instead).
+
+Usage (from the discord_bot directory):
+
+    python bench_content_codec.py [--contents 10000] [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+import uuid as uuidlib
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from content_service import Content
+
+
+@dataclass
+class LegacyContent:
+    uuid: str
+    time_utc: datetime
+    title: str
+    description: str
+    created_by: str
+    tags: List[str] = field(default_factory=list)
+    group_ids: List[str] = field(default_factory=list)
+    location: Optional[str] = None
+    members: Dict[str, str] = field(default_factory=dict)
+    slots: Dict[str, str] = field(default_factory=dict)
+    guild_id: Optional[str] = None
+    guild_name: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+
+    def to_document(self) -> dict:
+        return asdict(self)
+
+
+def legacy_from_document(doc: Dict[str, Any]) -> LegacyContent:
+    return LegacyContent(
+        uuid=doc["uuid"],
+        time_utc=doc["time_utc"],
+        title=doc["title"],
+        description=doc["description"],
+        created_by=doc["created_by"],
+        tags=doc.get("tags", []),
+        group_ids=doc.get("group_ids", []),
+        location=doc.get("location"),
+        members=doc.get("members", {}),
+        slots=doc.get("slots", {}),
+        guild_id=doc.get("guild_id"),
+        guild_name=doc.get("guild_name"),
+        created_at=doc.get("created_at", datetime.utcnow()),
+        updated_at=doc.get("updated_at", datetime.utcnow()),
+    )
+
+
+def _document(i: int) -> Dict[str, Any]:
+    members: Dict[str, str] = {}
+    slots: Dict[str, str] = {}
+    for n in range(40):
+        user_id = str(100_000_000_000_000_000 + i * 100 + n)
+        g, r = n // 20 + 1, n % 20 + 1
+        members[user_id] = f"{g}.{r}"
+        slots[f"{g}:{r}"] = user_id
+    now = datetime.utcnow()
+    return {
+        "uuid": str(uuidlib.uuid4()),
+        "time_utc": now,
+        "title": f"ZvZ {i}",
+        "description": "Mass at the portal",
+        "created_by": "123456789012345678",
+        "tags": ["zvz"],
+        "group_ids": [str(uuidlib.uuid4()), str(uuidlib.uuid4())],
+        "location": "Lymhurst",
+        "members": members,
+        "slots": slots,
+        "guild_id": "758506006778478595",
+        "guild_name": "Guild",
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _decode_indexed(doc: Dict[str, Any]) -> Content:
+    content = Content.from_document(doc)
+    content.assignments
+    return content
+
+
+def _best(fn: Callable[[], Any], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _bytes_per_object(
+    decode: Callable[[Dict[str, Any]], Any], docs: List[dict]
+) -> float:
+    # documents are allocated before tracing starts, so only the objects
+    # themselves (and, for "after", the assignment index) are counted
+    gc.collect()
+    tracemalloc.start()
+    objects = [decode(d) for d in docs]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / len(docs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Content encode / decode")
+    parser.add_argument("--contents", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    docs = [_document(i) for i in range(args.contents)]
+    cases = [
+        ("before", legacy_from_document),
+        ("after", Content.from_document),
+        ("after+index", _decode_indexed),
+    ]
+
+    print(
+        f"{'model':<11} | {'decode/s':>10} | {'encode/s':>10} "
+        f"| {'bytes/object':>12}"
+    )
+    print("-" * 54)
+    for name, decode in cases:
+        objects = [decode(d) for d in docs]
+        decode_s = _best(lambda: [decode(d) for d in docs], args.rounds)
+        encode_s = _best(
+            lambda objects=objects: [o.to_document() for o in objects], args.rounds
+        )
+        del objects
+        size = _bytes_per_object(decode, docs)
+        print(
+            f"{name:<11} | {len(docs) / decode_s:>10.0f} "
+            f"| {len(docs) / encode_s:>10.0f} | {size:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Micro-benchmark: latency of fetching one content by uuid for guilds with
+10, 1,000 and 10,000 contents.
+
+Compares
+- legacy layout, whole guild document + linear search in Python
+- legacy layout, $elemMatch projection (only the matching subdocument)
+- dedicated contents collection (what get_content_by_uuid does today)
+
+Needs a running MongoDB (MONGODB_URI). Writes to a scratch database
+"<MONGODB_DB>_bench" which is dropped afterwards.
+
+Usage (from the discord_bot directory):
+
+    python bench_content_lookup.py [--lookups 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid as uuidlib
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from content_service import CONTENT_PROJECTION  # noqa: E402
+from db import get_client, mongo_config  # noqa: E402
+
+SIZES = (10, 1_000, 10_000)
+
+
+def _fake_content(i: int, guild_id: str) -> Dict:
+    return {
+        "uuid": str(uuidlib.uuid4()),
+        "guild_id": guild_id,
+        "time_utc": datetime(2025, 1, 1, 18, 0),
+        "title": f"Event {i}",
+        "description": "Weekly static run, bring food and potions.",
+        "created_by": "123456789012345678",
+        "tags": ["static", "pve"],
+        "group_ids": [str(uuidlib.uuid4()) for _ in range(4)],
+        "location": "Brecilien",
+        "members": {str(100000 + n): f"1.{n}" for n in range(8)},
+        "slots": {f"1:{n}": str(100000 + n) for n in range(8)},
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }
+
+
+async def _time_lookups(
+    lookup: Callable[[str], Awaitable[object]], uuids: List[str], n: int
+) -> List[float]:
+    samples = []
+    for u in random.choices(uuids, k=n):
+        start = time.perf_counter()
+        found = await lookup(u)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert found is not None
+    return samples
+
+
+async def run(lookups: int) -> None:
+    db = get_client()[f"{mongo_config().db_name}_bench"]
+    legacy = db["legacy_guilds"]
+    contents = db["contents"]
+    await contents.create_index("uuid", unique=True)
+
+    print(f"{'contents':>9} | {'variant':<24} | {'p50 ms':>8} | {'p95 ms':>8}")
+    print("-" * 60)
+    try:
+        for size in SIZES:
+            guild_id = f"guild-{size}"
+            docs = [_fake_content(i, guild_id) for i in range(size)]
+            uuids = [d["uuid"] for d in docs]
+
+            await legacy.insert_one({"guild_id": guild_id, "contents": docs})
+            await contents.insert_many([dict(d) for d in docs])
+
+            async def full_document(u: str) -> object:
+                guild_doc = await legacy.find_one({"contents.uuid": u})
+                return next(c for c in guild_doc["contents"] if c["uuid"] == u)
+
+            async def elem_match(u: str) -> object:
+                guild_doc = await legacy.find_one(
+                    {"contents.uuid": u},
+                    {"_id": 0, "contents": {"$elemMatch": {"uuid": u}}},
+                )
+                return guild_doc["contents"][0]
+
+            async def dedicated(u: str) -> object:
+                return await contents.find_one({"uuid": u}, CONTENT_PROJECTION)
+
+            variants = (
+                ("legacy full document", full_document),
+                ("legacy $elemMatch", elem_match),
+                ("dedicated collection", dedicated),
+            )
+            for name, lookup in variants:
+                samples = await _time_lookups(lookup, uuids, lookups)
+                p50 = statistics.median(samples)
+                p95 = statistics.quantiles(samples, n=20)[-1]
+                print(f"{size:>9} | {name:<24} | {p50:>8.2f} | {p95:>8.2f}")
+    finally:
+        await get_client().drop_database(db.name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Content lookup latency")
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.lookups))
+
+
+if __name__ == "__main__":
+    main()
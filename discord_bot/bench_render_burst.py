@@ -0,0 +1,155 @@
+"""
+Simulated signup burst: N role picks on one message within a few seconds,
+re-rendered either once per click (the old RoleSelect.callback) or through
+RenderScheduler.
+
+The fake message enforces Discord's edit limit of 5 edits per 5 seconds per
+channel (calls beyond it wait, as discord.py does on a 429) and takes a
+fixed latency per edit. A "render" simulates the content reload + embed
+rebuild.
+
+No Discord connection or database needed.
+
+Usage (from the discord_bot directory):
+
+    python bench_render_burst.py [--clicks 40] [--spread 5] [--window 1.0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Deque, List
+
+from render_scheduler import RenderScheduler
+
+
+class FakeMessage:
+    def __init__(self, latency: float, per: float = 5.0, limit: int = 5) -> None:
+        self.latency = latency
+        self.per = per
+        self.limit = limit
+        self.edits = 0
+        self.rate_limited_for = 0.0
+        self.shown_state = -1
+        self._sent: Deque[float] = deque()
+        self._lock = asyncio.Lock()
+
+    async def edit(self, state: int) -> None:
+        async with self._lock:
+            now = time.perf_counter()
+            while self._sent and now - self._sent[0] >= self.per:
+                self._sent.popleft()
+            if len(self._sent) >= self.limit:
+                wait = self.per - (now - self._sent[0])
+                self.rate_limited_for += wait
+                await asyncio.sleep(wait)
+                self._sent.popleft()
+            self._sent.append(time.perf_counter())
+        await asyncio.sleep(self.latency)
+        self.edits += 1
+        self.shown_state = max(self.shown_state, state)
+
+
+class Content:
+    """Stands in for the content document: the number of picks so far."""
+
+    def __init__(self, build_cost: float) -> None:
+        self.state = 0
+        self.build_cost = build_cost
+        self.renders = 0
+
+    async def render(self, message: FakeMessage) -> None:
+        state = self.state  # re-read "from the database"
+        await asyncio.sleep(self.build_cost)
+        self.renders += 1
+        await message.edit(state)
+
+
+def _click_times(clicks: int, spread: float, seed: int) -> List[float]:
+    rng = random.Random(seed)
+    return sorted(rng.uniform(0, spread) for _ in range(clicks))
+
+
+async def _per_click(args: argparse.Namespace) -> dict:
+    message = FakeMessage(args.latency)
+    content = Content(args.build_cost)
+    start = time.perf_counter()
+
+    async def click(at: float) -> None:
+        await asyncio.sleep(at)
+        content.state += 1
+        await content.render(message)
+
+    await asyncio.gather(
+        *(click(t) for t in _click_times(args.clicks, args.spread, args.seed))
+    )
+    return _result(content, message, start)
+
+
+async def _scheduled(args: argparse.Namespace) -> dict:
+    message = FakeMessage(args.latency)
+    content = Content(args.build_cost)
+    scheduler = RenderScheduler(window=args.window)
+    start = time.perf_counter()
+
+    async def click(at: float) -> None:
+        await asyncio.sleep(at)
+        content.state += 1
+        scheduler.schedule("message", lambda: content.render(message))
+
+    await asyncio.gather(
+        *(click(t) for t in _click_times(args.clicks, args.spread, args.seed))
+    )
+    await scheduler.drain()
+    return _result(content, message, start)
+
+
+def _result(content: Content, message: FakeMessage, start: float) -> dict:
+    return {
+        "renders": content.renders,
+        "edits": message.edits,
+        "rate limited s": message.rate_limited_for,
+        "converged s": time.perf_counter() - start,
+        "latest shown": message.shown_state == content.state,
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    rows = [
+        ("per click", await _per_click(args)),
+        ("scheduled", await _scheduled(args)),
+    ]
+    print(
+        f"{args.clicks} clicks over {args.spread:.1f}s, window {args.window:.2f}s, "
+        f"edit latency {args.latency * 1000:.0f}ms"
+    )
+    print(
+        f"{'mode':<10} | {'renders':>7} | {'edits':>5} | {'rate limited s':>14} "
+        f"| {'converged s':>11} | latest shown"
+    )
+    print("-" * 72)
+    for name, r in rows:
+        print(
+            f"{name:<10} | {r['renders']:>7} | {r['edits']:>5} "
+            f"| {r['rate limited s']:>14.2f} | {r['converged s']:>11.2f} "
+            f"| {r['latest shown']}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Signup burst re-rendering")
+    parser.add_argument("--clicks", type=int, default=40)
+    parser.add_argument("--spread", type=float, default=5.0, help="seconds")
+    parser.add_argument("--window", type=float, default=1.0, help="seconds")
+    parser.add_argument("--latency", type=float, default=0.08, help="per edit")
+    parser.add_argument("--build-cost", type=float, default=0.01, help="per render")
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Signup message rendering: header text, one embed per party and the dropdown
+metadata.
+
+The last display built for each content is kept in memory. When only role
+assignments changed, the cached embeds are patched in place: just the lines
+of the changed slots are recomputed and only the embed fields (columns)
+containing them are replaced. Slots whose holder was not in the member
+cache when drawn are redrawn on every render until the name resolves. A
+full rebuild happens on first render and whenever the group structure
+(groups and their role lists) changes.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import discord
+from shared.cache import TTLCache
+
+from content_service import Content, Slot, load_groups_with_roles, parse_slot_key
+
+# roles per embed column
+COLUMN_SIZE = 10
+
+# (group uuid, role uuids or None when the group is missing) per party
+Structure = Tuple[Tuple[str, Optional[Tuple[str, ...]]], ...]
+
+
+@dataclass
+class ContentDisplay:
+    structure: Structure
+    header_text: str
+    party_embeds: List[discord.Embed]
+    select_specs: List[Dict[str, Any]]
+    # per party: role names and the rendered role lines
+    role_names: List[List[str]]
+    role_lines: List[List[str]]
+    assignments: Dict[Slot, int]
+    # raw slots map ("g:r" -> user id) `assignments` was last updated from
+    slots: Dict[str, str]
+    # assigned slots drawn without the member's name (not cached yet)
+    unresolved: Set[Slot]
+
+    def patch(self, guild: discord.Guild, content: Content) -> None:
+        """
+        Bring the embeds up to date with `content`, touching only the
+        fields whose slots changed or still lack their member's name.
+        """
+        if self.slots or not self.assignments:
+            changed = self._apply_slots(content.slots)
+        else:
+            # built from a contents document that predates the slots map
+            changed = self._apply_assignments(content.assignments)
+
+        dirty_columns: Set[Tuple[int, int]] = set()
+        for g, r in changed | self.unresolved:
+            if not (1 <= g <= len(self.role_names)):
+                continue
+            names = self.role_names[g - 1]
+            if not (1 <= r <= len(names)):
+                continue
+            line, resolved = _role_line(
+                guild, r, names[r - 1], self.assignments.get((g, r))
+            )
+            if resolved:
+                self.unresolved.discard((g, r))
+            else:
+                self.unresolved.add((g, r))
+            if line != self.role_lines[g - 1][r - 1]:
+                self.role_lines[g - 1][r - 1] = line
+                dirty_columns.add((g, (r - 1) // COLUMN_SIZE))
+
+        for g, column in dirty_columns:
+            lines = self.role_lines[g - 1]
+            _set_column(self.party_embeds[g - 1], lines, column)
+
+    def _apply_slots(self, slots: Dict[str, str]) -> Set[Slot]:
+        """
+        Update `assignments` from the raw slots map, parsing only the keys
+        whose holder differs from the previous render. Returns those slots.
+        """
+        changed: Set[Slot] = set()
+        for key in self.slots.keys() | slots.keys():
+            user_key = slots.get(key)
+            if self.slots.get(key) == user_key:
+                continue
+            slot = parse_slot_key(key)
+            if slot is None:
+                continue
+            if user_key is not None and user_key.isdigit():
+                self.assignments[slot] = int(user_key)
+            else:
+                self.assignments.pop(slot, None)
+            changed.add(slot)
+        self.slots = slots
+        return changed
+
+    def _apply_assignments(self, assignments: Dict[Slot, int]) -> Set[Slot]:
+        changed = {
+            slot
+            for slot in self.assignments.keys() | assignments.keys()
+            if self.assignments.get(slot) != assignments.get(slot)
+        }
+        self.assignments = assignments
+        return changed
+
+
+# content uuid -> last display; entries for finished events just expire
+_displays: TTLCache[str, ContentDisplay] = TTLCache(
+    maxsize=int(os.getenv("DISPLAY_CACHE_MAX_ENTRIES", "1000")),
+    ttl=float(os.getenv("DISPLAY_CACHE_TTL_SECONDS", "21600")),
+)
+
+
+def _role_line(
+    guild: discord.Guild, role_index: int, role_name: str, user_id: Optional[int]
+) -> Tuple[str, bool]:
+    """
+    The line for one slot, and False when its holder is not in the member
+    cache (the line then lacks the name and must be redrawn later).
+    """
+    line = f"{role_index}. {role_name}"
+    if user_id is None:
+        return f"❌ {line}", True
+    member = guild.get_member(user_id)
+    if member:
+        return f"✅ {line} - {member.display_name}", True
+    return line, False
+
+
+def _set_column(embed: discord.Embed, lines: List[str], column: int) -> None:
+    start = column * COLUMN_SIZE
+    embed.set_field_at(
+        column,
+        name="\u200b",
+        value="\n".join(lines[start : start + COLUMN_SIZE]),
+        inline=True,
+    )
+
+
+def _header_text(content: Content, guild: discord.Guild) -> str:
+    date_str = content.time_utc.strftime("%d.%m.%y")
+    time_str = content.time_utc.strftime("%H:%M")
+    location_str = content.location or "Not specified"
+
+    host_member = (
+        guild.get_member(int(content.created_by)) if content.created_by else None
+    )
+    if host_member is not None:
+        host_text = host_member.mention
+    else:
+        host_text = f"<@{content.created_by}>" if content.created_by else "Unknown"
+
+    return (
+        f"**{content.title}**\n"
+        f"hosted by {host_text}\n"
+        f"{content.description}\n"
+        f"**Date:** {date_str}\n"
+        f"**Time (UTC):** **{time_str}**\n"
+        f"**Location:** {location_str}"
+    )
+
+
+def _full_build(
+    content: Content,
+    guild: discord.Guild,
+    structure: Structure,
+    roles_by_uuid: Dict[str, dict],
+    assignments: Dict[Slot, int],
+) -> ContentDisplay:
+    party_embeds: List[discord.Embed] = []
+    select_specs: List[Dict[str, Any]] = []
+    all_names: List[List[str]] = []
+    all_lines: List[List[str]] = []
+    unresolved: Set[Slot] = set()
+
+    for idx, (group_id, role_uuids) in enumerate(structure, start=1):
+        if role_uuids is None:
+            embed = discord.Embed(
+                title=f"Party {idx}",
+                description="Group not found in database.",
+                color=discord.Color.blurple(),
+            )
+            embed.set_footer(text=f"uuid: {group_id}")
+            party_embeds.append(embed)
+            all_names.append([])
+            all_lines.append([])
+            continue
+
+        names: List[str] = []
+        for role_index, role_uuid in enumerate(role_uuids, start=1):
+            role_doc = roles_by_uuid.get(role_uuid)
+            if role_doc and "name" in role_doc:
+                names.append(role_doc["name"])
+            else:
+                names.append(f"Role {role_index}")
+
+        lines: List[str] = []
+        for r, name in enumerate(names, start=1):
+            line, resolved = _role_line(guild, r, name, assignments.get((idx, r)))
+            lines.append(line)
+            if not resolved:
+                unresolved.add((idx, r))
+
+        party_embed = discord.Embed(
+            title=f"Party {idx}",
+            color=discord.Color.blurple(),
+        )
+        if lines:
+            # one column per COLUMN_SIZE roles (1–10, 11–20)
+            for start in range(0, len(lines), COLUMN_SIZE):
+                party_embed.add_field(
+                    name="\u200b",
+                    value="\n".join(lines[start : start + COLUMN_SIZE]),
+                    inline=True,
+                )
+        else:
+            party_embed.add_field(
+                name="\u200b", value="_No roles in this group yet._", inline=True
+            )
+        party_embed.set_footer(text=f"uuid: {group_id}")
+        party_embeds.append(party_embed)
+        all_names.append(names)
+        all_lines.append(lines)
+
+        if names:
+            select_specs.append(
+                {
+                    "group_index": idx,
+                    "group_id": group_id,
+                    "roles": [
+                        {"index": r, "name": name}
+                        for r, name in enumerate(names, start=1)
+                    ],
+                }
+            )
+
+    return ContentDisplay(
+        structure=structure,
+        header_text=_header_text(content, guild),
+        party_embeds=party_embeds,
+        select_specs=select_specs,
+        role_names=all_names,
+        role_lines=all_lines,
+        assignments=assignments,
+        slots=content.slots,
+        unresolved=unresolved,
+    )
+
+
+async def build_content_display(
+    content: Content,
+    guild: discord.Guild,
+) -> Tuple[str, List[discord.Embed], List[Dict[str, Any]]]:
+    """
+    Builds:
+    - plain text header message (title, host, date, time, location)
+    - party embeds with roles (and assigned players)
+    - metadata for dropdowns: which group has which roles
+
+    Reuses and patches the previous display of this content when its group
+    structure is unchanged.
+    """
+    # served from the group / role caches after the first render
+    groups_by_uuid, roles_by_uuid = await load_groups_with_roles(content.group_ids)
+    structure: Structure = tuple(
+        (
+            group_id,
+            tuple(groups_by_uuid[group_id].get("roles", []))
+            if group_id in groups_by_uuid
+            else None,
+        )
+        for group_id in content.group_ids
+    )
+    display = _displays.get(content.uuid)
+    if display is None or display.structure != structure:
+        # the only place the whole slots map is parsed
+        display = _full_build(
+            content, guild, structure, roles_by_uuid, dict(content.assignments)
+        )
+        _displays.set(content.uuid, display)
+    else:
+        display.patch(guild, content)
+
+    return display.header_text, display.party_embeds, display.select_specs
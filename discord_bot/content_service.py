@@ -1,16 +1,22 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Dict, List, Optional, Iterable
+from typing import Any, Dict, List, Mapping, Optional, Iterable, Tuple
 
 import uuid as uuidlib
 import discord
+from shared.repositories import (
+    load_groups_with_roles as shared_load_groups_with_roles,
+)
 
-from db import get_db
+from db import content_repository, group_repository, role_repository
 
+# (group position, role index), both 1-based
+Slot = Tuple[int, int]
 
-@dataclass
+
+@dataclass(slots=True)
 class Content:
     uuid: str
     time_utc: datetime
@@ -22,17 +28,114 @@ class Content:
     location: Optional[str] = None
     # "discord_user_id": "role_index" or "groupIndex.roleIndex" (e.g. "1.2")
     members: Dict[str, str] = field(default_factory=dict)
+    # reverse index used for atomic claims: "groupIndex:roleIndex" -> user id
+    slots: Dict[str, str] = field(default_factory=dict)
+    guild_id: Optional[str] = None
+    guild_name: Optional[str] = None
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
 
+    # Typed index over slots / members, built on first use and not stored:
+    # (group, role) -> user id
+    _assignments: Optional[Dict[Slot, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def assignments(self) -> Dict[Slot, int]:
+        if self._assignments is None:
+            self.reindex()
+        return self._assignments  # type: ignore[return-value]
+
+    def reindex(self) -> None:
+        """
+        Rebuild the assignment index from the slots map or, for contents
+        written before slots existed, from the members refs.
+        """
+        assignments: Dict[Slot, int] = {}
+        if self.slots:
+            # the slots map decides who holds a slot
+            for key, user_key in self.slots.items():
+                slot = parse_slot_key(key)
+                if slot is not None and user_key.isdigit():
+                    assignments[slot] = int(user_key)
+        else:
+            for user_key, ref in self.members.items():
+                slot = decode_role_ref(ref)
+                if slot is None or not user_key.isdigit():
+                    continue
+                assignments.setdefault(slot, int(user_key))
+
+        self._assignments = assignments
+
     def to_document(self) -> dict:
-        return asdict(self)
+        """
+        BSON-ready dict of the stored fields. Shallow: lists / dicts are
+        shared with this object, not copied.
+        """
+        return {
+            "uuid": self.uuid,
+            "time_utc": self.time_utc,
+            "title": self.title,
+            "description": self.description,
+            "created_by": self.created_by,
+            "tags": self.tags,
+            "group_ids": self.group_ids,
+            "location": self.location,
+            "members": self.members,
+            "slots": self.slots,
+            "guild_id": self.guild_id,
+            "guild_name": self.guild_name,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+    @classmethod
+    def from_document(cls, doc: Mapping[str, Any]) -> "Content":
+        """
+        Inverse of to_document; takes ownership of the document's lists /
+        dicts (fresh from the driver, so nothing else holds them).
+        """
+        return cls(
+            uuid=doc["uuid"],
+            time_utc=doc["time_utc"],
+            title=doc["title"],
+            description=doc["description"],
+            created_by=doc["created_by"],
+            tags=doc.get("tags") or [],
+            group_ids=doc.get("group_ids") or [],
+            location=doc.get("location"),
+            members=doc.get("members") or {},
+            slots=doc.get("slots") or {},
+            guild_id=doc.get("guild_id"),
+            guild_name=doc.get("guild_name"),
+            created_at=doc.get("created_at") or datetime.utcnow(),
+            updated_at=doc.get("updated_at") or datetime.utcnow(),
+        )
+
+
+# Stored fields, in document order
+CONTENT_FIELDS = tuple(f.name for f in fields(Content) if f.init)
+
+# Only the fields Content needs; keeps _id and any stray keys off the wire
+CONTENT_PROJECTION = {"_id": 0, **{name: 1 for name in CONTENT_FIELDS}}
+
+
+async def load_groups_with_roles(
+    group_ids: Iterable[str],
+) -> Tuple[Dict[str, dict], Dict[str, dict]]:
+    """
+    Bulk-load group documents and all roles they reference.
 
+    Reads through the in-process group / role caches; whatever is missing is
+    fetched with at most two queries (one `$in` on groups, one `$in` on roles)
+    regardless of how many groups / roles the content has.
 
-async def _contents_collection():
-    db = get_db()
-    # collection name is "contents"
-    return db["contents"]
+    Returns (groups_by_uuid, roles_by_uuid).
+    """
+    return await shared_load_groups_with_roles(
+        group_repository(), role_repository(), group_ids
+    )
 
 
 def encode_role_ref(group_position: int, role_index: int, multi_groups: bool) -> str:
@@ -46,6 +149,39 @@ def encode_role_ref(group_position: int, role_index: int, multi_groups: bool) ->
     return str(role_index)
 
 
+def decode_role_ref(ref: str) -> Optional[Tuple[int, int]]:
+    """
+    Inverse of encode_role_ref. Legacy "role only" refs map to group 1.
+    Returns None for malformed refs.
+    """
+    g_str, sep, r_str = ref.partition(".")
+    if not sep:
+        g_str, r_str = "1", ref
+    try:
+        return int(g_str), int(r_str)
+    except ValueError:
+        return None
+
+
+def slot_key(group_position: int, role_index: int) -> str:
+    """
+    Key of a slot inside content.slots. Mongo field names cannot contain
+    dots, so this uses "g:r" instead of the "g.r" role ref format.
+    """
+    return f"{group_position}:{role_index}"
+
+
+def parse_slot_key(key: str) -> Optional[Slot]:
+    """
+    Inverse of slot_key. Returns None for malformed keys.
+    """
+    g_str, _, r_str = key.partition(":")
+    try:
+        return int(g_str), int(r_str)
+    except ValueError:
+        return None
+
+
 async def init_content(
     guild: discord.Guild,
     time_utc: datetime,
@@ -57,12 +193,13 @@ async def init_content(
     location: Optional[str] = None,
 ) -> Content:
     """
-    Create a new content entry inside the guild document in /contents collection.
+    Create a new content document in the /contents collection.
 
-    - One document per guild: { guild_id, guild_name, contents: [ ... ] }
-    - Each content is a subdocument inside contents[].
+    - One document per content, indexed by uuid and (guild_id, time_utc).
+    - Older deployments stored contents[] inside one document per guild;
+      migrate_contents.py moves those over.
     """
-    col = await _contents_collection()
+    contents = content_repository()
 
     group_ids_list = list(group_ids)
     if not group_ids_list:
@@ -81,26 +218,11 @@ async def init_content(
         group_ids=group_ids_list,
         location=location,
         created_by=created_by,
+        guild_id=str(guild.id),
+        guild_name=guild.name,
     )
 
-    # Upsert the guild document and push this content into contents[]
-    await col.update_one(
-        {"guild_id": str(guild.id)},
-        {
-            "$setOnInsert": {
-                "guild_id": str(guild.id),
-                "created_at": datetime.utcnow(),
-            },
-            "$set": {
-                "guild_name": guild.name,
-                "updated_at": datetime.utcnow(),
-            },
-            "$push": {
-                "contents": content.to_document(),
-            },
-        },
-        upsert=True,
-    )
+    await contents.insert(content.to_document())
 
     return content
 
@@ -114,89 +236,60 @@ async def add_member_to_content(
     """
     Try to assign user to (group_position, role_index).
 
+    The claim is a single conditional update that only matches while the
+    slot is still free, so two users racing for the same slot cannot both
+    win. If the user held another slot in this content, it is released
+    afterwards.
+
     Returns True if assignment succeeded, False if the slot is already taken.
     """
-    col = await _contents_collection()
-
-    # Find the guild document that contains this content
-    guild_doc = await col.find_one({"contents.uuid": content_uuid})
-    if not guild_doc:
-        raise ValueError(f"Content {content_uuid} not found")
-
-    contents = guild_doc.get("contents", [])
-    content_doc = next((c for c in contents if c.get("uuid") == content_uuid), None)
-    if not content_doc:
-        raise ValueError(f"Content {content_uuid} not found in guild document")
-
-    group_ids = content_doc.get("group_ids", [])
-    if not (1 <= group_position <= len(group_ids)):
+    if group_position < 1:
         raise ValueError("group_position is out of range for this content")
 
-    multi_groups = len(group_ids) > 1
-    role_ref = encode_role_ref(group_position, role_index, multi_groups)
+    contents = content_repository()
+
+    slot = slot_key(group_position, role_index)
+    role_ref = encode_role_ref(group_position, role_index, multi_groups=True)
     user_key = str(user_id)
 
-    members = content_doc.get("members", {})
+    before = await contents.claim_slot(
+        content_uuid, group_position, slot, user_key, role_ref
+    )
 
-    # If this role_ref is already used by someone else, do NOT assign
-    if role_ref in members.values():
+    if before is None:
+        # Either the slot is taken or the content / group does not exist;
+        # only the failure path pays for telling those apart.
+        if not await contents.has_group(content_uuid, group_position):
+            raise ValueError(
+                f"Content {content_uuid} not found or group_position out of range"
+            )
         return False
 
-    # Otherwise, assign this user to this role
-    await col.update_one(
-        {"guild_id": guild_doc["guild_id"], "contents.uuid": content_uuid},
-        {
-            "$set": {
-                f"contents.$.members.{user_key}": role_ref,
-                "updated_at": datetime.utcnow(),
-                "contents.$.updated_at": datetime.utcnow(),
-            }
-        },
-    )
+    # The user switched roles: free the slot they held before
+    previous_ref = before.get("members", {}).get(user_key)
+    previous = decode_role_ref(previous_ref) if previous_ref else None
+    if previous is not None and slot_key(*previous) != slot:
+        await contents.release_slot(content_uuid, slot_key(*previous), user_key)
 
     return True
 
 
 async def remove_member_from_content(content_uuid: str, user_id: int) -> None:
-    col = await _contents_collection()
+    contents = content_repository()
+    user_key = str(user_id)
 
-    guild_doc = await col.find_one({"contents.uuid": content_uuid})
-    if not guild_doc:
+    before = await contents.unset_member(content_uuid, user_key)
+    if before is None:
         return  # nothing to do
 
-    await col.update_one(
-        {"guild_id": guild_doc["guild_id"], "contents.uuid": content_uuid},
-        {
-            "$unset": {f"contents.$.members.{user_id}": ""},
-            "$set": {
-                "updated_at": datetime.utcnow(),
-                "contents.$.updated_at": datetime.utcnow(),
-            },
-        },
-    )
+    previous_ref = before.get("members", {}).get(user_key)
+    previous = decode_role_ref(previous_ref) if previous_ref else None
+    if previous is not None:
+        await contents.release_slot(content_uuid, slot_key(*previous), user_key)
 
 
 async def get_content_by_uuid(content_uuid: str) -> Optional[Content]:
-    col = await _contents_collection()
-    guild_doc = await col.find_one({"contents.uuid": content_uuid})
-    if not guild_doc:
-        return None
-
-    contents = guild_doc.get("contents", [])
-    content_doc = next((c for c in contents if c.get("uuid") == content_uuid), None)
+    content_doc = await content_repository().get(content_uuid, CONTENT_PROJECTION)
     if not content_doc:
         return None
-
-    return Content(
-        uuid=content_doc["uuid"],
-        time_utc=content_doc["time_utc"],
-        title=content_doc["title"],
-        description=content_doc["description"],
-        created_by=content_doc["created_by"],
-        tags=content_doc.get("tags", []),
-        group_ids=content_doc.get("group_ids", []),
-        location=content_doc.get("location"),
-        members=content_doc.get("members", {}),
-        created_at=content_doc.get("created_at", datetime.utcnow()),
-        updated_at=content_doc.get("updated_at", datetime.utcnow()),
-    )
+    return Content.from_document(content_doc)
@@ -1,19 +1,66 @@
 import os
+
+from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from shared.cache import TTLCache
+from shared.migrations import run_migrations
+from shared.mongo import MongoConfig, create_client
+from shared.repositories import (
+    ContentRepository,
+    GroupRepository,
+    RoleRepository,
+)
 
-MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/discord_content_bot")
-MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "discord_content_bot")
+load_dotenv()
 
 _client: AsyncIOMotorClient | None = None
+_config: MongoConfig | None = None
+
+
+def mongo_config() -> MongoConfig:
+    global _config
+    if _config is None:
+        _config = MongoConfig.from_env()
+    return _config
 
 
 def get_client() -> AsyncIOMotorClient:
     global _client
     if _client is None:
-        _client = AsyncIOMotorClient(MONGODB_URI)
+        _client = create_client(mongo_config())
     return _client
 
 
 def get_db() -> AsyncIOMotorDatabase:
     client = get_client()
-    return client[MONGODB_DB_NAME]
+    return client[mongo_config().db_name]
+
+
+async def migrate_schema() -> None:
+    """
+    Apply pending schema migrations (indexes), shared with the web API.
+    """
+    await run_migrations(get_db())
+
+
+# Group / role definitions keyed by uuid. Groups can be PATCHed through the
+# web API, which lives in another process, so the bot keeps them only briefly.
+_cache_size = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+group_cache: TTLCache[str, dict] = TTLCache(
+    maxsize=_cache_size, ttl=float(os.getenv("CACHE_GROUP_TTL_SECONDS", "30"))
+)
+role_cache: TTLCache[str, dict] = TTLCache(
+    maxsize=_cache_size, ttl=float(os.getenv("CACHE_ROLE_TTL_SECONDS", "3600"))
+)
+
+
+def group_repository() -> GroupRepository:
+    return GroupRepository(get_db(), group_cache)
+
+
+def role_repository() -> RoleRepository:
+    return RoleRepository(get_db(), role_cache)
+
+
+def content_repository() -> ContentRepository:
+    return ContentRepository(get_db())
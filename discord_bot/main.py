@@ -1,18 +1,20 @@
-from typing import Optional, Any, Dict, List, Tuple
+from typing import Optional, Any, Dict, List
 from datetime import datetime, date, time
 import os
+import re
 import discord
 from discord import app_commands
 from discord.ext import commands
 from dotenv import load_dotenv
 
+from content_display import build_content_display
 from content_service import (
     init_content,
     add_member_to_content,
     get_content_by_uuid,
-    Content,
 )
-from db import get_db
+from db import migrate_schema
+from render_scheduler import RenderScheduler
 
 load_dotenv()
 
@@ -25,6 +27,9 @@ GUILD_ID = int(os.getenv("DISCORD_GUILD_ID", "0"))  # or hardcode: 1234567890123
 if GUILD_ID == 0:
     raise RuntimeError("Set DISCORD_GUILD_ID in .env or hardcode GUILD_ID")
 
+# seconds of role picks collected into one message edit
+RENDER_DEBOUNCE_SECONDS = float(os.getenv("RENDER_DEBOUNCE_SECONDS", "1.0"))
+
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
@@ -32,179 +37,62 @@ intents.members = True
 # intents.message_content = True
 
 
-async def build_content_display(
-    content: Content,
-    guild: discord.Guild,
-) -> Tuple[str, List[discord.Embed], List[Dict[str, Any]]]:
-    """
-    Builds:
-    - plain text header message (title, host, date, time, location)
-    - party embeds with roles (and assigned players)
-    - metadata for dropdowns: which group has which roles
-    """
-
-    db = get_db()
-    groups_col = db["groups"]
-    roles_col = db["roles"]
-
-    # ----- header -----
-    date_str = content.time_utc.strftime("%d.%m.%y")
-    time_str = content.time_utc.strftime("%H:%M")
-    location_str = content.location or "Not specified"
-
-    host_member = (
-        guild.get_member(int(content.created_by)) if content.created_by else None
-    )
-    if host_member is not None:
-        host_text = host_member.mention
-    else:
-        host_text = f"<@{content.created_by}>" if content.created_by else "Unknown"
-
-    header_text = (
-        f"**{content.title}**\n"
-        f"hosted by {host_text}\n"
-        f"{content.description}\n"
-        f"**Date:** {date_str}\n"
-        f"**Time (UTC):** **{time_str}**\n"
-        f"**Location:** {location_str}"
-    )
-
-    # ----- decode assignments from content.members -----
-    assignments: Dict[Tuple[int, int], List[int]] = {}
-    group_count = len(content.group_ids)
-
-    for user_id_str, ref in content.members.items():
-        try:
-            user_id = int(user_id_str)
-        except ValueError:
-            continue
-
-        if "." in ref:
-            g_str, r_str = ref.split(".", 1)
-            try:
-                g = int(g_str)
-                r = int(r_str)
-            except ValueError:
-                continue
-        else:
-            # legacy "role only" format – assume single group
-            try:
-                r = int(ref)
-            except ValueError:
-                continue
-            g = 1 if group_count >= 1 else 1
+render_scheduler = RenderScheduler(window=RENDER_DEBOUNCE_SECONDS)
 
-        assignments.setdefault((g, r), []).append(user_id)
-
-    party_embeds: List[discord.Embed] = []
-    select_specs: List[Dict[str, Any]] = []
-
-    # ----- build Party embeds + dropdown meta -----
-    for idx, group_id in enumerate(content.group_ids, start=1):
-        group_doc = await groups_col.find_one({"uuid": group_id})
-        if not group_doc:
-            embed = discord.Embed(
-                title=f"Party {idx}",
-                description="Group not found in database.",
-                color=discord.Color.blurple(),
-            )
-            embed.set_footer(text=f"uuid: {group_id}")
-            party_embeds.append(embed)
-            continue
-
-        # group_doc.get("name") or f"Party {idx}"
-        group_name = f"Party {idx}"
-        role_uuids = group_doc.get("roles", [])
-
-        role_lines: List[str] = []
-        role_meta: List[Dict[str, Any]] = []
-
-        if not role_uuids:
-            role_lines.append("_No roles in this group yet._")
-        else:
-            for role_index, role_uuid in enumerate(role_uuids, start=1):
-                role_doc = await roles_col.find_one({"uuid": role_uuid})
-                if role_doc and "name" in role_doc:
-                    role_name = role_doc["name"]
-                else:
-                    role_name = f"Role {role_index}"
-
-                role_meta.append({"index": role_index, "name": role_name})
-
-                # check if someone is assigned to this (group, role)
-                assigned_ids = assignments.get((idx, role_index), [])
-                display_line = f"{role_index}. {role_name}"
-
-                if assigned_ids:
-                    member = guild.get_member(assigned_ids[0])
-                    print(member)
-                    if member:
-                        display_line = f"✅ {display_line} - {member.display_name}"
-                else:
-                    display_line = f"❌ {display_line}"
-
-                role_lines.append(display_line)
-
-        party_embed = discord.Embed(
-            title=group_name,
-            color=discord.Color.blurple(),
-        )
-
-        if role_lines:
-            if len(role_lines) <= 10:
-                # single column
-                col1 = "\n".join(role_lines)
-                party_embed.add_field(name="\u200b", value=col1, inline=True)
-            else:
-                # two columns: 1–10, 11–20
-                col1 = "\n".join(role_lines[:10])
-                col2 = "\n".join(role_lines[10:])
-                party_embed.add_field(name="\u200b", value=col1, inline=True)
-                party_embed.add_field(name="\u200b", value=col2, inline=True)
-        else:
-            party_embed.description = "_No roles in this group yet._"
-
-        party_embed.set_footer(text=f"uuid: {group_id}")
-        party_embeds.append(party_embed)
-
-        if role_meta:
-            select_specs.append(
-                {
-                    "group_index": idx,
-                    "group_id": group_id,
-                    "roles": role_meta,
-                }
-            )
-
-    return header_text, party_embeds, select_specs
 
+class RoleSelect(
+    discord.ui.DynamicItem[discord.ui.Select],
+    template=r"signup:(?P<uuid>[0-9a-fA-F-]+):(?P<group>[0-9]+)",
+):
+    """
+    Role dropdown of one party. The content uuid and group index live in the
+    custom_id ("signup:{uuid}:{group}"), so the select keeps working after a
+    restart without keeping or reloading anything per message: the class is
+    registered once in setup_hook and rebuilt from the custom_id when an
+    interaction arrives.
+    """
 
-class RoleSelect(discord.ui.Select):
     def __init__(
-        self, content_uuid: str, group_index: int, roles: List[Dict[str, Any]]
+        self,
+        content_uuid: str,
+        group_index: int,
+        roles: Optional[List[Dict[str, Any]]] = None,
     ):
+        # roles are only needed to send the select; a restored select keeps
+        # the options stored on the message
         options = [
             discord.SelectOption(
                 label=f"{r['index']}. {r['name']}",
                 value=f"{group_index}:{r['index']}",  # "group:role"
             )
-            for r in roles
+            for r in roles or []
         ]
 
-        placeholder = f"Party {group_index}: choose your role"
-
         super().__init__(
-            placeholder=placeholder,
-            min_values=1,
-            max_values=1,
-            options=options,
+            discord.ui.Select(
+                custom_id=f"signup:{content_uuid}:{group_index}",
+                placeholder=f"Party {group_index}: choose your role",
+                min_values=1,
+                max_values=1,
+                options=options,
+            )
         )
         self.content_uuid = content_uuid
+        self.group_index = group_index
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        interaction: discord.Interaction,
+        item: discord.ui.Select,
+        match: re.Match[str],
+    ) -> "RoleSelect":
+        return cls(match["uuid"], int(match["group"]))
 
     async def callback(self, interaction: discord.Interaction):
-        value = self.values[0]
-        group_str, role_str = value.split(":", 1)
-        group_index = int(group_str)
+        value = self.item.values[0]
+        _, _, role_str = value.partition(":")
+        group_index = self.group_index
         role_index = int(role_str)
 
         # Try to assign; returns False if slot already taken
@@ -223,28 +111,40 @@ class RoleSelect(discord.ui.Select):
             )
             return
 
-        # reload content from DB
-        content = await get_content_by_uuid(self.content_uuid)
-        if content is None or interaction.guild is None:
-            await interaction.response.send_message(
-                "Content not found anymore.", ephemeral=True
-            )
+        # ack now; the message is re-rendered once per burst of picks
+        await interaction.response.defer()
+        message = interaction.message
+        guild = interaction.guild
+        if message is None or guild is None:
             return
-
-        # rebuild header and parties (now including this assignment)
-        header_text, party_embeds, _ = await build_content_display(
-            content, interaction.guild
+        content_uuid = self.content_uuid
+        render_scheduler.schedule(
+            message.id,
+            lambda: rerender_content_message(message, guild, content_uuid),
         )
 
-        # update the original message (still keep same dropdowns)
-        await interaction.response.edit_message(
-            content=header_text,
-            embeds=party_embeds,
-            view=self.view,
-        )
+
+async def rerender_content_message(
+    message: discord.Message, guild: discord.Guild, content_uuid: str
+) -> None:
+    """
+    Rebuild header and parties from the current content and edit the
+    signup message (dropdowns stay as they are).
+    """
+    content = await get_content_by_uuid(content_uuid)
+    if content is None:
+        return
+
+    header_text, party_embeds, _ = await build_content_display(content, guild)
+    await message.edit(content=header_text, embeds=party_embeds)
 
 
 class RoleSignupView(discord.ui.View):
+    """
+    Only used to send the dropdowns; interactions are routed to RoleSelect
+    by custom_id.
+    """
+
     def __init__(self, content_uuid: str, select_specs: List[Dict[str, Any]]):
         super().__init__(timeout=None)
         self.content_uuid = content_uuid
@@ -259,13 +159,24 @@ class RoleSignupView(discord.ui.View):
             self.add_item(select)
 
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+class ContentBot(commands.Bot):
+    async def setup_hook(self) -> None:
+        # one registration serves every signup message, old and new
+        self.add_dynamic_items(RoleSelect)
+
+
+bot = ContentBot(command_prefix="!", intents=intents)
 
 
 @bot.event
 async def on_ready():
     print(f"Logged in as {bot.user} (ID: {bot.user.id})")
 
+    try:
+        await migrate_schema()
+    except Exception as e:
+        print(f"Failed to apply schema migrations: {e}")
+
     guild_obj = discord.Object(id=GUILD_ID)
 
     try:
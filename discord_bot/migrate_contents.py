@@ -0,0 +1,134 @@
+"""
+One-off migration: move contents embedded in per-guild documents
+({guild_id, guild_name, contents: [...]}) into one document per content.
+
+Legacy contents are streamed one by one via $unwind, so neither a huge guild
+document nor the whole history is ever held in memory, and written with
+bulk upserts in fixed-size batches. Upserts are keyed by uuid and only set
+fields on insert, so the script can be re-run safely after an interruption.
+
+Stop the bot before running it: legacy documents are deleted at the end.
+
+Usage (from the discord_bot directory):
+
+    python migrate_contents.py [--batch-size 500] [--keep-legacy]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+
+load_dotenv()
+
+from content_service import (  # noqa: E402
+    decode_role_ref,
+    slot_key,
+)
+from db import content_repository, migrate_schema  # noqa: E402
+
+LEGACY_FILTER = {"contents": {"$type": "array"}}
+
+
+def _legacy_pipeline() -> List[Dict[str, Any]]:
+    return [
+        {"$match": LEGACY_FILTER},
+        {"$project": {"_id": 0, "guild_id": 1, "guild_name": 1, "contents": 1}},
+        {"$unwind": "$contents"},
+        {
+            "$replaceRoot": {
+                "newRoot": {
+                    "$mergeObjects": [
+                        "$contents",
+                        {"guild_id": "$guild_id", "guild_name": "$guild_name"},
+                    ]
+                }
+            }
+        },
+    ]
+
+
+def _to_content_document(doc: Dict[str, Any]) -> Dict[str, Any]:
+    members: Dict[str, str] = doc.get("members") or {}
+    if "slots" not in doc:
+        # Backfill the slot map used by atomic claims
+        slots: Dict[str, str] = {}
+        for user_id, ref in members.items():
+            decoded = decode_role_ref(ref)
+            if decoded is not None:
+                slots.setdefault(slot_key(*decoded), user_id)
+        doc["slots"] = slots
+    doc.setdefault("members", members)
+    doc.setdefault("updated_at", datetime.utcnow())
+    return doc
+
+
+async def migrate(batch_size: int, keep_legacy: bool) -> None:
+    col = content_repository().collection
+    await migrate_schema()
+
+    migrated = 0
+    batch: List[UpdateOne] = []
+
+    async def flush() -> None:
+        nonlocal migrated
+        if not batch:
+            return
+        res = await col.bulk_write(batch, ordered=False)
+        migrated += len(batch)
+        print(
+            f"batch: {len(batch)} contents "
+            f"({res.upserted_count} new, total {migrated})"
+        )
+        batch.clear()
+
+    cursor = col.aggregate(
+        _legacy_pipeline(), batchSize=batch_size, allowDiskUse=True
+    )
+    async for doc in cursor:
+        if not doc.get("uuid"):
+            continue
+        content_doc = _to_content_document(doc)
+        batch.append(
+            UpdateOne(
+                {"uuid": content_doc["uuid"]},
+                {"$setOnInsert": content_doc},
+                upsert=True,
+            )
+        )
+        if len(batch) >= batch_size:
+            await flush()
+    await flush()
+
+    if keep_legacy:
+        print(f"Done: {migrated} contents migrated, legacy documents kept.")
+        return
+
+    res = await col.delete_many(LEGACY_FILTER)
+    print(
+        f"Done: {migrated} contents migrated, "
+        f"{res.deleted_count} legacy guild documents removed."
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move per-guild embedded contents into one document each."
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--keep-legacy",
+        action="store_true",
+        help="do not delete the per-guild documents after copying",
+    )
+    args = parser.parse_args()
+    asyncio.run(migrate(args.batch_size, args.keep_legacy))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Debounced, coalesced re-rendering of signup messages.
+
+Role picks arrive in bursts right after an event is posted. Instead of one
+rebuild + message edit per click, each click marks its message dirty; one
+task per message waits a short window, renders the latest state once, and
+repeats while new changes keep arriving. Because every render re-reads the
+content after the dirty flag is cleared, the message always converges on
+the latest state.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+log = logging.getLogger(__name__)
+
+Render = Callable[[], Awaitable[None]]
+
+
+@dataclass
+class _Pending:
+    render: Render
+    dirty: bool = True
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+
+class RenderScheduler:
+    def __init__(self, window: float = 1.0) -> None:
+        # seconds to collect changes before rendering; Discord allows about
+        # five edits per 5s per channel
+        self.window = window
+        self.requested = 0
+        self.rendered = 0
+        self._pending: Dict[Hashable, _Pending] = {}
+
+    def schedule(self, key: Hashable, render: Render) -> None:
+        """
+        Ask for `key` (usually the message id) to be re-rendered. Only the
+        most recent `render` callable is used, so it should read the current
+        state itself rather than capture a snapshot.
+        """
+        self.requested += 1
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = _Pending(render)
+            self._pending[key] = pending
+            pending.task = asyncio.create_task(self._run(key, pending))
+        else:
+            pending.render = render
+            pending.dirty = True
+
+    async def _run(self, key: Hashable, pending: _Pending) -> None:
+        try:
+            while pending.dirty:
+                await asyncio.sleep(self.window)
+                pending.dirty = False
+                try:
+                    await pending.render()
+                    self.rendered += 1
+                except Exception:
+                    log.exception("re-render of %r failed", key)
+        finally:
+            self._pending.pop(key, None)
+
+    async def drain(self) -> None:
+        """
+        Wait until every scheduled render has run (shutdown, benchmarks).
+        """
+        while self._pending:
+            await asyncio.gather(
+                *(p.task for p in list(self._pending.values()) if p.task)
+            )
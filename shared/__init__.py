@@ -0,0 +1,34 @@
+"""
+Data access shared by the web API (backend/) and the Discord bot
+(discord_bot/): Mongo client configuration, schema migrations, the in-process TTL/LRU
+cache and repositories with batched loaders.
+"""
+
+from .cache import TTLCache
+from .migrations import MIGRATIONS, Migration, MigrationError, run_migrations
+from .mongo import MongoConfig, create_client, warm_pool
+from .repositories import (
+    GROUP_PROJECTION,
+    ROLE_PROJECTION,
+    ContentRepository,
+    GroupRepository,
+    RoleRepository,
+    load_groups_with_roles,
+)
+
+__all__ = [
+    "TTLCache",
+    "MIGRATIONS",
+    "Migration",
+    "MigrationError",
+    "run_migrations",
+    "MongoConfig",
+    "create_client",
+    "warm_pool",
+    "GROUP_PROJECTION",
+    "ROLE_PROJECTION",
+    "ContentRepository",
+    "GroupRepository",
+    "RoleRepository",
+    "load_groups_with_roles",
+]
@@ -0,0 +1,205 @@
+"""
+Versioned schema migrations for the database shared by the API and the bot.
+
+Applied versions are recorded in the `schema_migrations` collection, so a
+process starting against an up-to-date database pays for a single query.
+Pending migrations run in version order; the index builds inside one
+migration are sent concurrently, one `createIndexes` command per collection.
+
+Migrations must be idempotent: two processes starting at the same time may
+both apply a pending one (creating an existing index is a no-op, and a
+dedup pass over already-unique data deletes nothing).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_COLLECTION = "schema_migrations"
+
+
+class MigrationError(RuntimeError):
+    """
+    A migration failed; it is not recorded, so it is retried on the next
+    start, and later migrations were not attempted.
+    """
+
+    def __init__(
+        self, version: int, name: str, collection: Optional[str], error: Exception
+    ) -> None:
+        self.version = version
+        self.name = name
+        self.collection = collection
+        where = f" on collection {collection!r}" if collection else ""
+        super().__init__(f"migration {version} ({name}) failed{where}: {error}")
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[AsyncIOMotorDatabase], Awaitable[None]]
+
+
+def index_migration(
+    version: int, name: str, indexes: Dict[str, List[IndexModel]]
+) -> Migration:
+    """
+    Migration creating `indexes` ({collection: [IndexModel, ...]}).
+    """
+
+    async def create(
+        db: AsyncIOMotorDatabase, col: str, models: List[IndexModel]
+    ) -> None:
+        try:
+            await db[col].create_indexes(models)
+        except Exception as e:
+            raise MigrationError(version, name, col, e) from e
+
+    async def apply(db: AsyncIOMotorDatabase) -> None:
+        await asyncio.gather(
+            *(create(db, col, models) for col, models in indexes.items())
+        )
+
+    return Migration(version, name, apply)
+
+
+def dedupe_migration(version: int, name: str, collection: str, key: str) -> Migration:
+    """
+    Migration keeping one document per value of `key` in `collection` (the
+    most recently inserted one), so a unique index on `key` can be built.
+    """
+
+    async def apply(db: AsyncIOMotorDatabase) -> None:
+        col = db[collection]
+        pipeline = [
+            {"$sort": {"_id": DESCENDING}},
+            {"$group": {"_id": f"${key}", "ids": {"$push": "$_id"}}},
+            {"$match": {"ids.1": {"$exists": True}}},
+        ]
+        removed = 0
+        try:
+            async for group in col.aggregate(pipeline, allowDiskUse=True):
+                result = await col.delete_many({"_id": {"$in": group["ids"][1:]}})
+                removed += result.deleted_count
+        except Exception as e:
+            raise MigrationError(version, name, collection, e) from e
+        if removed:
+            logger.warning(
+                "removed %s duplicate %s documents by %s", removed, collection, key
+            )
+
+    return Migration(version, name, apply)
+
+
+MIGRATIONS: List[Migration] = [
+    index_migration(
+        1,
+        "initial indexes",
+        {
+            "users": [IndexModel("discord.id", unique=True)],
+            "groups": [
+                IndexModel("uuid", unique=True),
+                # GET /groups: keyset pagination + filters
+                IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+                IndexModel(
+                    [
+                        ("tags", ASCENDING),
+                        ("created_at", DESCENDING),
+                        ("_id", DESCENDING),
+                    ]
+                ),
+                IndexModel(
+                    [
+                        ("creator_id", ASCENDING),
+                        ("created_at", DESCENDING),
+                        ("_id", DESCENDING),
+                    ]
+                ),
+                IndexModel("name"),
+            ],
+            "roles": [
+                IndexModel("uuid", unique=True),
+                # create_group dedup; roles stored before hashing have no hash
+                IndexModel(
+                    "content_hash",
+                    unique=True,
+                    partialFilterExpression={"content_hash": {"$exists": True}},
+                ),
+            ],
+            "items": [
+                # GET /items filters
+                IndexModel(
+                    [
+                        ("item_category_main", ASCENDING),
+                        ("item_category_second", ASCENDING),
+                        ("item_name", ASCENDING),
+                    ]
+                ),
+            ],
+            "contents": [
+                # sparse: legacy per-guild documents (see
+                # discord_bot/migrate_contents.py) have no uuid
+                IndexModel("uuid", unique=True, sparse=True),
+                IndexModel([("guild_id", ASCENDING), ("time_utc", ASCENDING)]),
+            ],
+        },
+    ),
+    # POST /items/seed used to insert blindly, so databases seeded more than
+    # once hold several rows per item_db_name
+    dedupe_migration(2, "dedupe items", "items", "item_db_name"),
+    index_migration(
+        3,
+        "unique item names",
+        # POST /items/seed upserts by item_db_name
+        {"items": [IndexModel("item_db_name", unique=True)]},
+    ),
+]
+
+
+async def run_migrations(
+    db: AsyncIOMotorDatabase, migrations: Sequence[Migration] = MIGRATIONS
+) -> List[int]:
+    """
+    Apply the migrations not yet recorded in `schema_migrations`.
+
+    Returns the versions applied by this call (empty when up to date).
+    Raises MigrationError, naming the migration and collection, on the
+    first failure.
+    """
+    col = db[MIGRATIONS_COLLECTION]
+    applied = {doc["_id"] async for doc in col.find({}, {"_id": 1})}
+    pending = sorted(
+        (m for m in migrations if m.version not in applied),
+        key=lambda m: m.version,
+    )
+
+    for migration in pending:
+        logger.info("applying migration %s: %s", migration.version, migration.name)
+        try:
+            await migration.apply(db)
+        except MigrationError:
+            raise
+        except Exception as e:
+            raise MigrationError(migration.version, migration.name, None, e) from e
+        await col.update_one(
+            {"_id": migration.version},
+            {
+                "$setOnInsert": {
+                    "name": migration.name,
+                    "applied_at": datetime.utcnow(),
+                }
+            },
+            upsert=True,
+        )
+
+    return [m.version for m in pending]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+DEFAULT_URI = "mongodb://localhost:27017/discord_content_bot"
+DEFAULT_DB = "discord_content_bot"
+
+
+def _int(env: Mapping[str, str], name: str, default: Optional[int]) -> Optional[int]:
+    value = env.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+@dataclass(frozen=True)
+class MongoConfig:
+    """
+    Connection settings shared by the API and the bot. Both read the same
+    MONGODB_* variables, so the two processes are tuned in one place.
+    """
+
+    uri: str = DEFAULT_URI
+    db_name: str = DEFAULT_DB
+    max_pool_size: int = 100
+    min_pool_size: int = 10
+    max_idle_time_ms: Optional[int] = 300_000
+    server_selection_timeout_ms: int = 5_000
+    connect_timeout_ms: int = 5_000
+    socket_timeout_ms: Optional[int] = 20_000
+    # comma separated, e.g. "zstd,snappy"; needs zstandard / python-snappy
+    compressors: Optional[str] = None
+    read_preference: str = "primary"
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str] = os.environ) -> "MongoConfig":
+        defaults = cls()
+        return cls(
+            uri=env.get("MONGODB_URI") or defaults.uri,
+            # MONGODB_DB_NAME is the bot's old name for MONGODB_DB
+            db_name=(
+                env.get("MONGODB_DB") or env.get("MONGODB_DB_NAME") or defaults.db_name
+            ),
+            max_pool_size=_int(env, "MONGODB_MAX_POOL_SIZE", defaults.max_pool_size),
+            min_pool_size=_int(env, "MONGODB_MIN_POOL_SIZE", defaults.min_pool_size),
+            max_idle_time_ms=_int(
+                env, "MONGODB_MAX_IDLE_TIME_MS", defaults.max_idle_time_ms
+            ),
+            server_selection_timeout_ms=_int(
+                env,
+                "MONGODB_SERVER_SELECTION_TIMEOUT_MS",
+                defaults.server_selection_timeout_ms,
+            ),
+            connect_timeout_ms=_int(
+                env, "MONGODB_CONNECT_TIMEOUT_MS", defaults.connect_timeout_ms
+            ),
+            socket_timeout_ms=_int(
+                env, "MONGODB_SOCKET_TIMEOUT_MS", defaults.socket_timeout_ms
+            ),
+            compressors=env.get("MONGODB_COMPRESSORS") or None,
+            read_preference=env.get("MONGODB_READ_PREFERENCE") or "primary",
+        )
+
+    def client_options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "serverSelectionTimeoutMS": self.server_selection_timeout_ms,
+            "connectTimeoutMS": self.connect_timeout_ms,
+            "readPreference": self.read_preference,
+        }
+        if self.max_idle_time_ms is not None:
+            options["maxIdleTimeMS"] = self.max_idle_time_ms
+        if self.socket_timeout_ms is not None:
+            options["socketTimeoutMS"] = self.socket_timeout_ms
+        if self.compressors:
+            options["compressors"] = self.compressors
+        return options
+
+
+def create_client(config: MongoConfig) -> AsyncIOMotorClient:
+    return AsyncIOMotorClient(config.uri, **config.client_options())
+
+
+async def warm_pool(client: AsyncIOMotorClient, connections: int) -> None:
+    """
+    Run concurrent pings so up to `connections` pooled connections are
+    opened before the first real request needs them.
+    """
+    await asyncio.gather(
+        *(client.admin.command("ping") for _ in range(max(1, connections)))
+    )
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+from .cache import TTLCache
+
+Document = Dict[str, Any]
+
+# Public fields of groups / roles; what both the API and the bot read.
+GROUP_PROJECTION: Dict[str, int] = {
+    "_id": 1,
+    "uuid": 1,
+    "name": 1,
+    "description": 1,
+    "tags": 1,
+    "roles": 1,
+    "creator_id": 1,
+    "created_at": 1,
+}
+
+ROLE_PROJECTION: Dict[str, int] = {
+    "_id": 1,
+    "uuid": 1,
+    "name": 1,
+    "description": 1,
+    "role_type": 1,
+    "items": 1,
+    "creator_id": 1,
+    "created_at": 1,
+    "content_hash": 1,
+}
+
+
+class _CachedByUuid:
+    """
+    Read-through access to a collection keyed by `uuid`, batching misses
+    into one `$in` query.
+    """
+
+    collection_name: str
+    projection: Mapping[str, int]
+
+    def __init__(self, db: AsyncIOMotorDatabase, cache: TTLCache[str, Document]):
+        self.db = db
+        self.cache = cache
+
+    @property
+    def collection(self):
+        return self.db[self.collection_name]
+
+    async def get(self, uuid: str) -> Optional[Document]:
+        return (await self.get_many([uuid])).get(uuid)
+
+    async def get_many(self, uuids: Iterable[str]) -> Dict[str, Document]:
+        wanted = [u for u in dict.fromkeys(uuids) if u]
+        found, missing = self.cache.get_many(wanted)
+        if missing:
+            cursor = self.collection.find({"uuid": {"$in": missing}}, self.projection)
+            async for doc in cursor:
+                self.cache.set(doc["uuid"], doc)
+                found[doc["uuid"]] = doc
+        return found
+
+    def remember(self, doc: Document) -> None:
+        self.cache.set(doc["uuid"], doc)
+
+    def invalidate(self, uuid: str) -> None:
+        self.cache.invalidate(uuid)
+
+
+class GroupRepository(_CachedByUuid):
+    """
+    Groups can be PATCHed, so writers must invalidate their entry.
+    """
+
+    collection_name = "groups"
+    projection = GROUP_PROJECTION
+
+
+class RoleRepository(_CachedByUuid):
+    """
+    Roles are immutable once stored (edits create a new uuid), so cached
+    entries only expire by TTL.
+    """
+
+    collection_name = "roles"
+    projection = ROLE_PROJECTION
+
+    async def find_by_content_hash(
+        self, hashes: Iterable[str]
+    ) -> Dict[str, Document]:
+        """
+        Stored roles with any of the given content hashes (unique index),
+        keyed by hash.
+        """
+        wanted = list(dict.fromkeys(hashes))
+        if not wanted:
+            return {}
+        cursor = self.collection.find(
+            {"content_hash": {"$in": wanted}},
+            {"_id": 0, "uuid": 1, "content_hash": 1},
+        )
+        return {doc["content_hash"]: doc async for doc in cursor}
+
+
+async def load_groups_with_roles(
+    groups: GroupRepository,
+    roles: RoleRepository,
+    group_ids: Iterable[str],
+) -> Tuple[Dict[str, Document], Dict[str, Document]]:
+    """
+    Bulk-load groups and every role they reference: at most two queries
+    (one `$in` on groups, one on roles) for whatever is not cached.
+
+    Returns (groups_by_uuid, roles_by_uuid).
+    """
+    groups_by_uuid = await groups.get_many(group_ids)
+    roles_by_uuid = await roles.get_many(
+        role_uuid
+        for group_doc in groups_by_uuid.values()
+        for role_uuid in group_doc.get("roles", [])
+    )
+    return groups_by_uuid, roles_by_uuid
+
+
+class ContentRepository:
+    """
+    One document per content in the `contents` collection, keyed by uuid.
+
+    Slot claims rely on the `slots` map ("g:r" -> user id) so a claim is a
+    single conditional update.
+    """
+
+    collection_name = "contents"
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+
+    @property
+    def collection(self):
+        return self.db[self.collection_name]
+
+    async def get(
+        self, uuid: str, projection: Optional[Mapping[str, int]] = None
+    ) -> Optional[Document]:
+        return await self.collection.find_one({"uuid": uuid}, projection or {"_id": 0})
+
+    async def insert(self, doc: Document) -> None:
+        await self.collection.insert_one(doc)
+
+    async def claim_slot(
+        self,
+        uuid: str,
+        group_position: int,
+        slot: str,
+        user_key: str,
+        role_ref: str,
+    ) -> Optional[Document]:
+        """
+        Atomically assign `slot` to the user if it is still free and the
+        group exists. Returns the user's previous `members` entry
+        ({"members": {...}}), or None when nothing matched.
+        """
+        return await self.collection.find_one_and_update(
+            {
+                "uuid": uuid,
+                f"group_ids.{group_position - 1}": {"$exists": True},
+                f"slots.{slot}": {"$exists": False},
+            },
+            {
+                "$set": {
+                    f"slots.{slot}": user_key,
+                    f"members.{user_key}": role_ref,
+                    "updated_at": datetime.utcnow(),
+                }
+            },
+            projection={"_id": 0, f"members.{user_key}": 1},
+            return_document=ReturnDocument.BEFORE,
+        )
+
+    async def has_group(self, uuid: str, group_position: int) -> bool:
+        doc = await self.collection.find_one(
+            {"uuid": uuid, f"group_ids.{group_position - 1}": {"$exists": True}},
+            {"_id": 1},
+        )
+        return doc is not None
+
+    async def release_slot(self, uuid: str, slot: str, user_key: str) -> None:
+        # only unset the slot while it still belongs to this user
+        await self.collection.update_one(
+            {"uuid": uuid, f"slots.{slot}": user_key},
+            {"$unset": {f"slots.{slot}": ""}},
+        )
+
+    async def unset_member(self, uuid: str, user_key: str) -> Optional[Document]:
+        """
+        Remove the user's members entry; returns it as it was before.
+        """
+        return await self.collection.find_one_and_update(
+            {"uuid": uuid},
+            {
+                "$unset": {f"members.{user_key}": ""},
+                "$set": {"updated_at": datetime.utcnow()},
+            },
+            projection={"_id": 0, f"members.{user_key}": 1},
+            return_document=ReturnDocument.BEFORE,
+        )